@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import connection
+from django.db.transaction import TransactionManagementError
+from django.utils import timezone
+
+from cards.models import Card
+
+if TYPE_CHECKING:
+    from typing import Any, Iterable
+
+
+class CardBulkLoader:
+    staging_table: str = "cards_card_staging"
+
+    def __init__(self, module_id: int) -> None:
+        self.module_id = module_id
+        self.staged = False
+
+    @staticmethod
+    def is_supported() -> bool:
+        return connection.vendor == "postgresql"
+
+    def __enter__(self) -> CardBulkLoader:
+        return self
+
+    def __exit__(self, exc_type: Any, *args: Any) -> None:
+        if self.staged and exc_type is None:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE IF EXISTS {self.staging}")
+        self.staged = False
+
+    @property
+    def staging(self) -> str:
+        return connection.ops.quote_name(self.staging_table)
+
+    @property
+    def table(self) -> str:
+        return connection.ops.quote_name(Card._meta.db_table)
+
+    @staticmethod
+    def column(field: str) -> str:
+        return connection.ops.quote_name(Card._meta.get_field(field).column)
+
+    def stage(self, rows: Iterable[tuple[int, str, str]]) -> int:
+        if not connection.in_atomic_block:
+            raise TransactionManagementError(
+                "Staging cards requires an active transaction."
+            )
+
+        count = 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {self.staging} ("
+                "line integer, original text, translation text"
+                ") ON COMMIT DROP"
+            )
+            self.staged = True
+            with cursor.copy(
+                f"COPY {self.staging} (line, original, translation) FROM STDIN"
+            ) as copy:
+                for row in rows:
+                    copy.write_row(row)
+                    count += 1
+        return count
+
+    def insert(self, ignore_conflicts: bool = False) -> int:
+        sql = (
+            f"INSERT INTO {self.table} ("
+            f"{self.column('original')}, {self.column('translation')}, "
+            f"{self.column('created')}, {self.column('module')}"
+            f") SELECT original, translation, %s, %s FROM {self.staging} "
+            "ORDER BY line"
+        )
+        if ignore_conflicts:
+            sql += " ON CONFLICT DO NOTHING"
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [timezone.now(), self.module_id])
+            return cursor.rowcount
+
+    def conflicts(self, limit: int) -> list[int]:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT staged.line FROM {self.staging} staged "
+                f"JOIN {self.table} card "
+                f"ON card.{self.column('original')} = staged.original "
+                f"AND card.{self.column('translation')} = staged.translation "
+                f"AND card.{self.column('module')} = %s "
+                "ORDER BY staged.line LIMIT %s",
+                [self.module_id, limit],
+            )
+            return [line for (line,) in cursor.fetchall()]
+
+    def merge_from(self, module_ids: Iterable[int]) -> int:
+        original, translation = self.column("original"), self.column("translation")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table} ("
+                f"{original}, {translation}, "
+                f"{self.column('created')}, {self.column('module')}"
+                f") SELECT DISTINCT {original}, {translation}, %s, %s "
+                f"FROM {self.table} WHERE {self.column('module')} = ANY(%s) "
+                "ON CONFLICT DO NOTHING",
+                [timezone.now(), self.module_id, list(module_ids)],
+            )
+            return cursor.rowcount
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cards", "0003_card_created"),
+        ("modules", "0007_module_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="card",
+            index=models.Index(
+                fields=["module", "original", "id"],
+                name="cards_card_module__b4b7af_idx",
+            ),
+        ),
+    ]
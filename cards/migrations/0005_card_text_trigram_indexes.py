@@ -0,0 +1,41 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+from common.operations import (
+    PostgreSQLAddIndexConcurrently,
+    PostgreSQLTrigramExtension,
+)
+
+
+class Migration(migrations.Migration):
+    # Building the indexes must not lock the cards table for writes
+    atomic = False
+
+    dependencies = [
+        ("cards", "0004_card_module_original_index"),
+    ]
+
+    operations = [
+        PostgreSQLTrigramExtension(),
+        PostgreSQLAddIndexConcurrently(
+            model_name="card",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("original"),
+                    name="gin_trgm_ops",
+                ),
+                name="cards_card_original_trgm",
+            ),
+        ),
+        PostgreSQLAddIndexConcurrently(
+            model_name="card",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("translation"),
+                    name="gin_trgm_ops",
+                ),
+                name="cards_card_translation_trgm",
+            ),
+        ),
+    ]
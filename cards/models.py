@@ -1,13 +1,15 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 from common.queryset import build_manager
-from generic_status.models import Learnable
+from generic_status.models import Learnable, Reviewable
 from generic_status.queryset import AnnotateLearnedMixin
 from interactions.models import Savable
 from interactions.queryset import AnnotateSavedMixin
 
 
-class Card(Savable, Learnable, models.Model):
+class Card(Savable, Learnable, Reviewable, models.Model):
     objects = build_manager(AnnotateSavedMixin, AnnotateLearnedMixin)
 
     original = models.CharField(max_length=100)
@@ -22,6 +24,18 @@ class Card(Savable, Learnable, models.Model):
     class Meta:
         ordering = ["original"]
         unique_together = ("original", "translation", "module")
+        indexes = [
+            models.Index(fields=["module", "original", "id"]),
+            # Trigram indexes over the same expression icontains compares
+            GinIndex(
+                OpClass(Upper("original"), name="gin_trgm_ops"),
+                name="cards_card_original_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("translation"), name="gin_trgm_ops"),
+                name="cards_card_translation_trgm",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.original} - {self.translation}"
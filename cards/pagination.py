@@ -1,7 +1,15 @@
 from rest_framework.pagination import PageNumberPagination
 
+from common.pagination import FastCountMixin, KeysetModeMixin, KeysetPagination
 
-class CardPagination(PageNumberPagination):
+
+class CardPagination(KeysetModeMixin, FastCountMixin, PageNumberPagination):
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class CardKeysetPagination(KeysetPagination):
     page_size = 25
     page_size_query_param = "page_size"
-    max_page_size = 100
\ No newline at end of file
+    max_page_size = 100
@@ -1,4 +1,4 @@
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 
 from common.permissions import IsObjAdmin, partial_cls, RelatedObjPermissionProxy
 from generic_status.permissions import HasObjRoles
@@ -17,18 +17,21 @@ LIST_POLICY = RETRIEVE_POLICY
 
 LEARNS_POLICY = RETRIEVE_POLICY
 
+SEARCH_POLICY = [AllowAny]
+
 SAVES_POLICY = [IsAuthenticated, ModuleObjIsPublic | IsObjAdmin | ModuleObjIsOwner | ModuleHasViewerOrEditorRoles]
 
+# A DRF permission leads so the proxies compose through its metaclass
 CREATE_POLICY = [
     IsAuthenticated,
-    ModuleObjIsOwner
+    IsObjAdmin
+    | ModuleObjIsOwner
     | partial_cls(
         RelatedObjPermissionProxy,
         decorated=partial_cls(HasObjRoles, roles=["editor"]),
         model=Module,
         lookup_url_kwarg="module_pk",
-    )
-    | IsObjAdmin,
+    ),
 ]
 
 UPDATE_POLICY = CREATE_POLICY
@@ -42,6 +45,7 @@ POLICIES = {
     "list": LIST_POLICY,
     "learns": LEARNS_POLICY,
     "saves": SAVES_POLICY,
+    "search": SEARCH_POLICY,
     "create": CREATE_POLICY,
     "update": UPDATE_POLICY,
     "partial_update": PARTIAL_UPDATE_POLICY,
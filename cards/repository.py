@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import FloatField, Q
+from django.db.models.functions import Cast, Coalesce, Greatest, Upper
+
+from cards.models import Card
+from cards.serializers import CardSearchQuerySerializer
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+    from modules.models import Module
+
+
+class CardRepository:
+    @staticmethod
+    def of_modules(modules: QuerySet[Module]) -> QuerySet[Card]:
+        card_sets = (
+            modules.order_by()
+            .annotate(card_set=Coalesce("card_source_id", "id"))
+            .values("card_set")
+        )
+        return Card.objects.filter(module_id__in=card_sets)
+
+    @staticmethod
+    def search(qs: QuerySet[Card], text: str, mode: str) -> QuerySet[Card]:
+        # Both lookups compare the upper-cased text covered by the trigram indexes
+        qs = qs.alias(
+            original_upper=Upper("original"), translation_upper=Upper("translation")
+        )
+        if mode == CardSearchQuerySerializer.Mode.SUBSTRING:
+            condition = Q(original__icontains=text) | Q(translation__icontains=text)
+        else:
+            condition = Q(original_upper__trigram_similar=text) | Q(
+                translation_upper__trigram_similar=text
+            )
+        return (
+            qs.filter(condition)
+            .annotate(
+                # Double precision so that cursor positions round-trip exactly
+                similarity=Cast(
+                    Greatest(
+                        TrigramSimilarity("original_upper", text),
+                        TrigramSimilarity("translation_upper", text),
+                    ),
+                    FloatField(),
+                )
+            )
+            .order_by("-similarity", "pk")
+        )
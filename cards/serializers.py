@@ -1,10 +1,19 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import models
 from rest_framework import serializers
 
 from cards.models import Card
+from common.user_state import UserStateBooleanField, UserStateCharField
+
+if TYPE_CHECKING:
+    from typing import Any
 
 
 class CardSerializer(serializers.ModelSerializer):
-    saved = serializers.BooleanField(read_only=True)
+    saved = UserStateBooleanField()
 
     class Meta:
         model = Card
@@ -12,10 +21,30 @@ class CardSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "module", "saved"]
 
 
+class CardDueSerializer(serializers.ModelSerializer):
+    due_at = serializers.DateTimeField(read_only=True)
+    interval = serializers.IntegerField(read_only=True)
+    ease = serializers.FloatField(read_only=True)
+    repetitions = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Card
+        fields = [
+            "id",
+            "original",
+            "translation",
+            "module",
+            "due_at",
+            "interval",
+            "ease",
+            "repetitions",
+        ]
+
+
 class CardShortSerializer(serializers.ModelSerializer):
-    saved = serializers.BooleanField()
+    saved = UserStateBooleanField()
 
-    learned_status = serializers.CharField()
+    learned_status = UserStateCharField()
 
     class Meta:
         model = Card
@@ -33,3 +62,34 @@ class CardCreateRelatedSerializer(serializers.ModelSerializer):
     class Meta:
         model = Card
         fields = ["original", "translation"]
+
+
+class CardSearchQuerySerializer(serializers.Serializer):
+    class Mode(models.TextChoices):
+        SUBSTRING = "substring"
+        SIMILAR = "similar"
+
+    class Scope(models.TextChoices):
+        MODULE = "module"
+        ACCESSIBLE = "accessible"
+        PUBLIC = "public"
+
+    q = serializers.CharField(min_length=3, max_length=100)
+    mode = serializers.ChoiceField(choices=Mode.choices, default=Mode.SIMILAR)
+    scope = serializers.ChoiceField(choices=Scope.choices, default=Scope.ACCESSIBLE)
+    module = serializers.IntegerField(required=False)
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if attrs["scope"] == self.Scope.MODULE and "module" not in attrs:
+            raise serializers.ValidationError(
+                {"module": "This field is required for the module scope."}
+            )
+        return attrs
+
+
+class CardSearchSerializer(serializers.ModelSerializer):
+    similarity = serializers.FloatField()
+
+    class Meta:
+        model = Card
+        fields = ["id", "original", "translation", "module", "similarity"]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete
+from django.dispatch import receiver
+
+from cards.models import Card
+from modules.models import Module
+
+if TYPE_CHECKING:
+    from typing import Any, Type
+    from django.db.models import Model
+
+
+def is_card_write(kwargs: dict[str, Any]) -> bool:
+    # Cascades from a module or user delete take the whole card set with them
+    origin = kwargs.get("origin")
+    return (
+        origin is None
+        or isinstance(origin, Card)
+        or (getattr(origin, "model", None) is Card)
+    )
+
+
+@receiver([pre_save, pre_delete], sender=Card)
+def prepare_module_cards_write(
+    sender: Type[Model], instance: Card, **kwargs: Any
+) -> None:
+    if is_card_write(kwargs) and Module.shares_cards(instance.module_id):
+        instance.module.prepare_cards_write()
+
+
+@receiver(post_save, sender=Card)
+def count_saved_card(
+    sender: Type[Model], instance: Card, created: bool, **kwargs: Any
+) -> None:
+    if created:
+        Module.add_cards_count(instance.module_id, 1)
+    else:
+        Module.bump_cards_version(instance.module_id)
+
+
+@receiver(post_delete, sender=Card)
+def count_deleted_card(sender: Type[Model], instance: Card, **kwargs: Any) -> None:
+    if is_card_write(kwargs):
+        Module.add_cards_count(instance.module_id, -1)
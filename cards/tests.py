@@ -1 +1,86 @@
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APITestCase
 
+from cards.models import Card
+from generic_status.models import Learn, Perm
+from languages.models import Language
+from modules.models import Module
+from topics.models import Topic
+from users.models import User
+
+
+class SharedCardAccessTests(APITestCase):
+    def setUp(self) -> None:
+        self.owner = User.objects.create(username="owner", email="owner@x.io")
+        self.user = User.objects.create(username="user", email="user@x.io")
+        self.source = Module.objects.create(
+            name="Source",
+            user=self.owner,
+            topic=Topic.objects.create(name="General"),
+            lang_from=Language.objects.create(code="EN", name="English"),
+            lang_to=Language.objects.create(code="DE", name="German"),
+            visible=Module.Status.PUBLIC,
+        )
+        self.card = Card.objects.create(
+            module=self.source, original="hund", translation="dog"
+        )
+        self.copy = self.source.copy(self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_editor_who_owns_a_copy_edits_the_source(self) -> None:
+        Perm.objects.create(
+            user=self.user,
+            content_type=ContentType.objects.get_for_model(Module),
+            object_id=self.source.pk,
+            perm=Perm.Status.EDITOR,
+        )
+
+        response = self.client.patch(
+            f"/api/v1/cards/{self.card.pk}/", {"translation": "hound"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.translation, "hound")
+        self.copy.refresh_from_db()
+        self.assertEqual(self.copy.cards.get().translation, "dog")
+
+    def test_copy_owner_edits_their_copy(self) -> None:
+        response = self.client.patch(
+            f"/api/v1/cards/{self.card.pk}/", {"translation": "hound"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.translation, "dog")
+        self.copy.refresh_from_db()
+        self.assertIsNone(self.copy.card_source_id)
+        self.assertEqual(self.copy.cards.get().translation, "hound")
+
+    def test_copy_owner_learns_after_the_source_goes_private(self) -> None:
+        self.copy.visible = Module.Status.PRIVATE
+        self.copy.save()
+        self.source.visible = Module.Status.PRIVATE
+        self.source.save()
+
+        response = self.client.post(
+            f"/api/v1/cards/{self.card.pk}/learns/",
+            {"learned": Learn.Status.LEARNED},
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(
+            Learn.objects.filter(user=self.user, object_id=self.card.pk).exists()
+        )
+
+    def test_stranger_cannot_reach_private_shared_cards(self) -> None:
+        Module.objects.filter(pk__in=[self.source.pk, self.copy.pk]).update(
+            visible=Module.Status.PRIVATE
+        )
+        self.client.force_authenticate(
+            User.objects.create(username="stranger", email="stranger@x.io")
+        )
+
+        response = self.client.get(f"/api/v1/cards/{self.card.pk}/")
+
+        self.assertEqual(response.status_code, 403)
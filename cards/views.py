@@ -2,27 +2,58 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.db.models import Case, When
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import viewsets
+from rest_framework.decorators import action
 
+from abstracts.permissions import PublicIncludedLink
 from cards.filters import CardFilter
 from cards.models import Card
-from cards.pagination import CardPagination
-from cards.serializers import CardSerializer, CardCreateSerializer
+from cards.pagination import CardKeysetPagination, CardPagination
+from cards.repository import CardRepository
+from cards.serializers import (
+    CardSerializer,
+    CardCreateSerializer,
+    CardDueSerializer,
+    CardSearchQuerySerializer,
+    CardSearchSerializer,
+)
 from common.decorators import swagger_safe_permissions
 from common.exeptions import UnRegisteredPolicy
+from common.permissions import OwnerIncludedLink, get_accessible_q, partial_cls
 from common.policy import PolicyRegistry
-from generic_status.views import LearnMixin
+from common.views import UserStateMixin
+from generic_status.permissions import PermissionIncludedLink
+from generic_status.views import LearnMixin, ReviewMixin
 from interactions.views import SaveMixin
+from modules.models import Module
+from modules.progress import ModuleProgress
+from modules.service import ModuleService
 
 if TYPE_CHECKING:
     from rest_framework.permissions import BasePermission
+    from rest_framework.request import Request
+    from rest_framework.response import Response
     from django.db.models import QuerySet
 
+CARD_WRITE_ACTIONS = {"update", "partial_update", "destroy"}
+
+CARD_WRITE_CHAIN_LINKS = [
+    OwnerIncludedLink,
+    partial_cls(PermissionIncludedLink, model=Module, perms=["editor"]),
+]
+
 
 @extend_schema(tags=["cards"])
-class CardViewSet(SaveMixin, LearnMixin, viewsets.ModelViewSet):
+@extend_schema_view(
+    due_reviews=extend_schema(responses=CardDueSerializer(many=True)),
+)
+class CardViewSet(
+    UserStateMixin, SaveMixin, LearnMixin, ReviewMixin, viewsets.ModelViewSet
+):
     filter_backends = [DjangoFilterBackend]
     filterset_class = CardFilter
     pagination_class = CardPagination
@@ -32,11 +63,103 @@ class CardViewSet(SaveMixin, LearnMixin, viewsets.ModelViewSet):
     def get_queryset(self) -> QuerySet[Card]:
         return Card.objects.all()
 
+    def get_bulk_queryset(self) -> QuerySet[Card]:
+        if self.request.user.is_staff:
+            return Card.objects.all()
+        # Cards are reachable through any module the user can list
+        modules = Module.objects.filter(
+            get_accessible_q(self.request, ModuleService.LIST_ACTION_CHAIN_LINKS)
+        )
+        return CardRepository.of_modules(modules)
+
+    def learns_changed(self, object_ids: list[int]) -> None:
+        card_set_ids = (
+            Card.objects.filter(pk__in=object_ids)
+            .values_list("module_id", flat=True)
+            .distinct()
+        )
+        ModuleProgress.invalidate(self.request.user.pk, card_set_ids)
+
+    def get_object(self) -> Card:
+        card = get_object_or_404(self.get_queryset(), pk=self.kwargs["pk"])
+        module = self.get_card_module(card)
+        if module.pk != card.module_id and self.action in CARD_WRITE_ACTIONS:
+            # The owner of a copy edits their own cards, not the shared set
+            module.materialize_cards()
+            card = get_object_or_404(
+                module.cards, original=card.original, translation=card.translation
+            )
+        self.check_object_permissions(self.request, module)
+        return card
+
+    def get_card_module(self, card: Card) -> Module:
+        # A shared card is authorized through the module the user reached it
+        # from, the source when allowed there and one of its copies otherwise
+        if self.has_module_permission(card.module):
+            return card.module
+        user = self.request.user
+        if self.action in CARD_WRITE_ACTIONS:
+            links = CARD_WRITE_CHAIN_LINKS
+        else:
+            links = ModuleService.LIST_ACTION_CHAIN_LINKS
+        copy = (
+            Module.objects.filter(card_source_id=card.module_id)
+            .filter(get_accessible_q(self.request, links))
+            .order_by(
+                Case(When(user_id=user.pk, then=0), default=1),
+                "-created",
+            )
+            .first()
+        )
+        return card.module if copy is None else copy
+
+    def has_module_permission(self, module: Module) -> bool:
+        return all(
+            permission.has_object_permission(self.request, self, module)
+            for permission in self.get_permissions()
+        )
+
+    @extend_schema(
+        filters=False,
+        parameters=[CardSearchQuerySerializer],
+        responses=CardSearchSerializer(many=True),
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        pagination_class=CardKeysetPagination,
+    )
+    def search(self, request: Request) -> Response:
+        params = CardSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        scope = params.validated_data["scope"]
+
+        if scope == CardSearchQuerySerializer.Scope.PUBLIC:
+            links = [PublicIncludedLink]
+        else:
+            links = ModuleService.LIST_ACTION_CHAIN_LINKS
+        modules = Module.objects.filter(get_accessible_q(request, links))
+
+        if scope == CardSearchQuerySerializer.Scope.MODULE:
+            module = get_object_or_404(modules, pk=params.validated_data["module"])
+            qs = Card.objects.filter(module_id=module.card_set_id)
+        else:
+            qs = CardRepository.of_modules(modules)
+
+        qs = CardRepository.search(
+            qs, params.validated_data["q"], params.validated_data["mode"]
+        )
+        page = self.paginate_queryset(qs)
+        serializer = CardSearchSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     def get_serializer_class(self):
         if self.action == "create":
             return CardCreateSerializer
         elif self.action in {"retrieve", "list", "update", "partial_update"}:
             return CardSerializer
+        elif self.action == "due_reviews":
+            return CardDueSerializer
         return super().get_serializer_class()
 
     @swagger_safe_permissions
@@ -9,6 +9,10 @@ function Start-NewPowerShellWindow($command) {
 Start-NewPowerShellWindow "celery -A qz worker -l info --pool=solo"
 Start-Sleep -Seconds 5
 
+# Start io worker (background import/export jobs)
+Start-NewPowerShellWindow "celery -A qz worker -l info --pool=solo -Q io -n io@%h"
+Start-Sleep -Seconds 5
+
 # Start celery beat
 Start-NewPowerShellWindow "celery -A qz beat -l info --schedule celery/celerybeat-schedule"
 Start-Sleep -Seconds 5
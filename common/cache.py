@@ -0,0 +1,16 @@
+CACHE_COUNT_KEY = "pagination:count:{digest}"
+CACHE_COUNT_TTL = 30
+COUNT_ESTIMATE_THRESHOLD = 100_000
+
+WRITE_BEHIND_PENDING_KEY = "write_behind:pending:{user_id}"
+WRITE_BEHIND_FLUSHING_KEY = "write_behind:flushing:{user_id}"
+WRITE_BEHIND_LOCK_KEY = "write_behind:lock:{user_id}"
+WRITE_BEHIND_QUEUED_KEY = "write_behind:queued:{user_id}"
+WRITE_BEHIND_DIRTY_KEY = "write_behind:dirty"
+WRITE_BEHIND_FLUSH_INTERVAL = 5
+WRITE_BEHIND_FLUSH_BATCH = 500
+# Oldest unflushed change a request tolerates before queueing a flush
+WRITE_BEHIND_MAX_LAG = 60
+WRITE_BEHIND_LOCK_TIMEOUT = 30
+# How long a bulk request waits for a running flush before buffering instead
+WRITE_BEHIND_REQUEST_WAIT = 0.5
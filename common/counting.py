@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from hashlib import md5
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
+from redis.exceptions import RedisError
+
+from common.cache import CACHE_COUNT_KEY, CACHE_COUNT_TTL, COUNT_ESTIMATE_THRESHOLD
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+def countable(queryset: QuerySet) -> QuerySet:
+    qs = queryset.order_by()
+    query = qs.query
+    if query.group_by is None and not query.distinct:
+        # The per-row annotations stay out of the select, the rows counted
+        # are still the rows listed
+        return qs.values("pk") if query.annotations else qs
+    # Grouped or distinct rows are one per key, counted on a clean clone
+    return qs.model._default_manager.filter(pk__in=qs.values("pk"))
+
+
+def fast_count(queryset: QuerySet | list) -> tuple[int, bool]:
+    if not hasattr(queryset, "query"):
+        return len(queryset), False
+
+    qs = countable(queryset)
+    sql, params = qs.query.sql_with_params()
+    digest = md5(f"{sql}{params!r}".encode()).hexdigest()
+    key = CACHE_COUNT_KEY.format(digest=digest)
+    # Cached counts only save queries, without Redis every count is fresh
+    try:
+        cached = cache.get(key)
+    except RedisError:
+        cached = None
+    if cached is not None:
+        return cached
+
+    result = None
+    if not queryset.query.where and connection.vendor == "postgresql":
+        # Unfiltered tables are counted from the planner's estimate when large
+        table = queryset.model._default_manager.order_by()
+        plan = json.loads(table.explain(format="json"))[0]["Plan"]
+        if plan["Plan Rows"] >= COUNT_ESTIMATE_THRESHOLD:
+            result = (int(plan["Plan Rows"]), True)
+    if result is None:
+        result = (qs.count(), False)
+    try:
+        cache.set(key, result, CACHE_COUNT_TTL)
+    except RedisError:
+        pass
+    return result
+
+
+class CountingPaginator(Paginator):
+    @cached_property
+    def counted(self) -> tuple[int, bool]:
+        return fast_count(self.object_list)
+
+    @cached_property
+    def count(self) -> int:
+        return self.counted[0]
+
+    @property
+    def approximate(self) -> bool:
+        return self.counted[1]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+if TYPE_CHECKING:
+    from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+    from django.db.migrations.state import ProjectState
+
+
+class PostgreSQLOnlyMixin:
+    # The state still changes everywhere so models and migrations agree,
+    # other backends just go without the PostgreSQL specific objects
+    def database_forwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class PostgreSQLAddIndex(PostgreSQLOnlyMixin, migrations.AddIndex):
+    pass
+
+
+class PostgreSQLAddIndexConcurrently(PostgreSQLOnlyMixin, AddIndexConcurrently):
+    pass
+
+
+class PostgreSQLTrigramExtension(PostgreSQLOnlyMixin, TrigramExtension):
+    pass
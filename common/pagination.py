@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, OrderBy, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from common.counting import CountingPaginator
+
+if TYPE_CHECKING:
+    from typing import Any
+    from django.db.models import Field, Model, QuerySet
+    from rest_framework.request import Request
+    from rest_framework.views import APIView
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, o: Any) -> Any:
+        # Keep full precision so that positions compare equal to stored values
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list[Model]:
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        reverse, position = self.decode_cursor(request, queryset)
+        ordering = self.ordering
+        if reverse:
+            ordering = [(name, not desc) for name, desc in ordering]
+        queryset = queryset.order_by(
+            *(f"-{name}" if desc else name for name, desc in ordering)
+        )
+        if position is not None:
+            queryset = queryset.filter(self.after(ordering, position))
+
+        page = list(queryset[: self.page_size + 1])
+        has_more = len(page) > self.page_size
+        page = page[: self.page_size]
+        if reverse:
+            page.reverse()
+
+        self.next_position = self.previous_position = None
+        if page and (has_more or reverse):
+            self.next_position = self.position(page[-1])
+        if page and (position is not None) and (has_more or not reverse):
+            self.previous_position = self.position(page[0])
+        return page
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset: QuerySet) -> list[tuple[str, bool]]:
+        ordering = []
+        for field in queryset.query.order_by or queryset.model._meta.ordering:
+            if isinstance(field, OrderBy) and isinstance(field.expression, F):
+                ordering.append((field.expression.name, field.descending))
+            elif isinstance(field, str):
+                ordering.append((field.lstrip("-"), field.startswith("-")))
+            else:
+                raise ImproperlyConfigured(
+                    f"Cannot page by cursor on the ordering {field!r}, "
+                    "order by field or annotation names."
+                )
+        # The primary key breaks ties so that every row has a unique position
+        if not any(name in {"pk", "id"} for name, _ in ordering):
+            ordering.append(("pk", ordering[-1][1] if ordering else False))
+        return ordering
+
+    @staticmethod
+    def after(ordering: list[tuple[str, bool]], position: list[Any]) -> Q:
+        condition = Q()
+        for index in reversed(range(len(ordering))):
+            name, desc = ordering[index]
+            lookup = "lt" if desc else "gt"
+            step = Q(**{f"{name}__{lookup}": position[index]})
+            if index < len(ordering) - 1:
+                step |= Q(**{name: position[index]}) & condition
+            condition = step
+        # A plain range on the leading column lets the index bound the scan
+        name, desc = ordering[0]
+        return Q(**{f"{name}__{'lte' if desc else 'gte'}": position[0]}) & condition
+
+    def position(self, obj: Model) -> list[Any]:
+        values = []
+        for name, _ in self.ordering:
+            value = obj
+            for attr in name.split("__"):
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    @staticmethod
+    def get_field(queryset: QuerySet, name: str) -> Field:
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        model = queryset.model
+        *path, name = name.split("__")
+        for part in path:
+            model = model._meta.get_field(part).related_model
+        if name == "pk":
+            return model._meta.pk
+        field = model._meta.get_field(name)
+        return field.target_field if field.is_relation else field
+
+    def decode_cursor(
+        self, request: Request, queryset: QuerySet
+    ) -> tuple[bool, list[Any] | None]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        fields = [self.get_field(queryset, name) for name, _ in self.ordering]
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode()))
+            reverse, position = bool(data["r"]), list(data["p"])
+            if len(position) != len(fields):
+                raise ValueError
+            # A tampered position has to fail here, not once the page is read
+            position = [
+                field.to_python(value) for field, value in zip(fields, position)
+            ]
+            if None in position:
+                raise ValueError
+        except (ValueError, KeyError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def encode_cursor(self, reverse: bool, position: list[Any]) -> str:
+        data = json.dumps({"r": int(reverse), "p": position}, cls=CursorEncoder)
+        cursor = urlsafe_b64encode(data.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_next_link(self) -> str | None:
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(False, self.next_position)
+
+    def get_previous_link(self) -> str | None:
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(True, self.previous_position)
+
+    def get_paginated_response(self, data: list[Any]) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque position returned in `next`/`previous`.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class KeysetModeMixin:
+    # Opt-in cursor mode for page number paginators, selected per request
+    keyset_pagination_class = KeysetPagination
+    mode_query_param = "pagination"
+    keyset_mode = "cursor"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list[Model]:
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_pagination_class()
+            self.keyset.page_size = self.page_size
+            self.keyset.page_size_query_param = self.page_size_query_param
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def use_keyset(self, request: Request) -> bool:
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == self.keyset_mode
+            or self.keyset_pagination_class.cursor_query_param in params
+        )
+
+    def get_paginated_response(self, data: list[Any]) -> Response:
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict[str, Any]]:
+        keyset = self.keyset_pagination_class()
+        cursor = [
+            parameter
+            for parameter in keyset.get_schema_operation_parameters(view)
+            if parameter["name"] == keyset.cursor_query_param
+        ]
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    f"Set to `{self.keyset_mode}` to page by cursor instead of "
+                    "page number; the response then has no `count`."
+                ),
+                "schema": {"type": "string", "enum": [self.keyset_mode]},
+            },
+            *cursor,
+        ]
+
+
+class FastCountMixin:
+    # Counts without unused annotations, cached, estimated for large tables
+    django_paginator_class = CountingPaginator
+
+    def get_paginated_response(self, data: list[Any]) -> Response:
+        response = super().get_paginated_response(data)
+        response.data["approximate"] = self.page.paginator.approximate
+        return response
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["approximate"] = {
+            "type": "boolean",
+            "description": "Whether `count` is a planner estimate.",
+        }
+        return response_schema
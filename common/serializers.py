@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import models
+from rest_framework import serializers
+
+if TYPE_CHECKING:
+    from typing import Any
+
+BULK_MAX_SIZE = 500
+
+
+def validate_unique_ids(ids: list[int]) -> list[int]:
+    if len(set(ids)) != len(ids):
+        raise serializers.ValidationError("Ids must be unique")
+    return ids
+
+
+class BulkIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=BULK_MAX_SIZE,
+        validators=[validate_unique_ids],
+    )
+
+
+class BulkItemsSerializer(serializers.Serializer):
+    # Subclasses set `items` to a many=True serializer with an `id` field
+    def validate_items(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        validate_unique_ids([item["id"] for item in items])
+        return items
+
+
+class BulkOutcomeSerializer(serializers.Serializer):
+    class Status(models.TextChoices):
+        CREATED = "created"
+        UPDATED = "updated"
+        EXISTS = "exists"
+        DELETED = "deleted"
+        ABSENT = "absent"
+        NOT_FOUND = "not_found"
+
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Status.choices)
+
+
+class BulkResultSerializer(serializers.Serializer):
+    results = BulkOutcomeSerializer(many=True)
@@ -4,6 +4,7 @@ from django.utils import timezone
 from celery import current_app
 
 from common.models import ScheduledTask
+from common.write_behind import WriteBehindBuffer
 
 
 @shared_task
@@ -22,3 +23,19 @@ def run_scheduled_tasks() -> None:
             except Exception:
                 task.status = "failed"
                 task.save(update_fields=["status"])
+
+
+@shared_task
+def flush_write_behind() -> int:
+    buffer = WriteBehindBuffer.connect()
+    if buffer is None:
+        return 0
+    return buffer.flush()
+
+
+@shared_task
+def flush_write_behind_user(user_id: int) -> int:
+    buffer = WriteBehindBuffer.connect()
+    if buffer is None:
+        return 0
+    return buffer.flush_user(user_id) or 0
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from redis.exceptions import ConnectionError
+
+from cards.models import Card
+from common.counting import fast_count
+from common.write_behind import WriteBehindBuffer
+from interactions.models import Save
+from languages.models import Language
+from modules.models import Module
+from topics.models import Topic
+from users.models import User
+
+
+class FastCountTests(TestCase):
+    def test_counts_without_the_cache_when_it_is_down(self) -> None:
+        Topic.objects.bulk_create(Topic(name=f"Topic {i}") for i in range(3))
+
+        with mock.patch("common.counting.cache") as cache:
+            cache.get.side_effect = cache.set.side_effect = ConnectionError
+            count = fast_count(Topic.objects.filter(name__startswith="Topic"))
+
+        self.assertEqual(count, (3, False))
+        cache.set.assert_called_once()
+
+
+class WriteBehindApplyTests(TestCase):
+    def test_changes_to_deleted_objects_leave_no_rows(self) -> None:
+        user = User.objects.create(username="user", email="user@x.io")
+        module = Module.objects.create(
+            name="Module",
+            user=user,
+            topic=Topic.objects.create(name="General"),
+            lang_from=Language.objects.create(code="EN", name="English"),
+            lang_to=Language.objects.create(code="DE", name="German"),
+        )
+        kept, deleted = (
+            Card.objects.create(module=module, original=word, translation=word)
+            for word in ("hund", "katze")
+        )
+        content_type_id = ContentType.objects.get_for_model(Card).id
+        entries = {
+            WriteBehindBuffer.field(Save, content_type_id, card.pk).encode(): b"{}"
+            for card in (kept, deleted)
+        }
+        deleted.delete()
+
+        WriteBehindBuffer.apply(user.pk, entries)
+
+        self.assertEqual(
+            list(Save.objects.values_list("object_id", flat=True)), [kept.pk]
+        )
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import serializers
+
+from common.write_behind import WriteBehindBuffer
+
+if TYPE_CHECKING:
+    from typing import Any, Iterable
+    from django.contrib.auth.models import AnonymousUser
+    from django.db.models import Model
+    from users.models import User
+
+# Serialized name: relation model, value column (None for a plain flag),
+# value without a row, value for anonymous users
+USER_STATE_RELATIONS: dict[str, tuple[str, str | None, Any, Any]] = {
+    "saved": ("interactions.Save", None, False, False),
+    "pinned": ("interactions.Pin", None, False, False),
+    "learned_status": ("generic_status.Learn", "learned", None, ""),
+    "user_rate": ("generic_status.Rate", "rate", None, None),
+    "user_perm": ("generic_status.Perm", "perm", None, ""),
+}
+
+
+class UserStateLoader:
+    def __init__(self, user: User | AnonymousUser) -> None:
+        self.user = user
+        self.ids: dict[int, set[int]] = defaultdict(set)
+        self.loaded: dict[tuple[str, int], dict[int, Any]] = {}
+
+    @staticmethod
+    def content_type_id(obj: Model) -> int:
+        return ContentType.objects.get_for_model(obj).id
+
+    def add(self, objects: Iterable[Model]) -> UserStateLoader:
+        for obj in objects:
+            self.ids[self.content_type_id(obj)].add(obj.pk)
+        return self
+
+    def covers(self, obj: Model) -> bool:
+        return obj.pk in self.ids.get(self.content_type_id(obj), ())
+
+    def get(self, obj: Model, name: str) -> Any:
+        label, column, default, anonymous = USER_STATE_RELATIONS[name]
+        if not self.user.is_authenticated:
+            return anonymous
+
+        key = (name, self.content_type_id(obj))
+        if key not in self.loaded:
+            self.loaded[key] = self.load(label, column, key[1])
+        return self.loaded[key].get(obj.pk, default)
+
+    def load(self, label: str, column: str | None, content_type_id: int) -> dict:
+        model = apps.get_model(label)
+        ids = self.ids[content_type_id]
+        # Read the buffer first, a flush deletes it only after committing
+        buffer = WriteBehindBuffer.connect(model)
+        changes = {}
+        if buffer is not None:
+            changes = buffer.changes(model, self.user.pk, content_type_id, ids)
+
+        # One lookup on the (user, content_type, object_id) index per relation
+        rows = model.objects.filter(
+            user=self.user, content_type_id=content_type_id, object_id__in=ids
+        )
+        if column is None:
+            state = dict.fromkeys(rows.values_list("object_id", flat=True), True)
+        else:
+            state = dict(rows.values_list("object_id", column))
+
+        for pk, values in changes.items():
+            if values is None:
+                state.pop(pk, None)
+            else:
+                state[pk] = True if column is None else values[column]
+        return state
+
+
+class UserStateFieldMixin:
+    # Reads the loader from the serializer context, else the annotation
+    def __init__(self, **kwargs: Any) -> None:
+        kwargs.setdefault("read_only", True)
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance: Model) -> Any:
+        loader = self.context.get("user_state")
+        if loader is not None and loader.covers(instance):
+            return loader.get(instance, self.field_name)
+        return super().get_attribute(instance)
+
+
+class UserStateBooleanField(UserStateFieldMixin, serializers.BooleanField):
+    pass
+
+
+class UserStateCharField(UserStateFieldMixin, serializers.CharField):
+    pass
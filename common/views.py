@@ -1 +1,134 @@
+from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+from django.contrib.contenttypes.models import ContentType
+from redis.exceptions import RedisError
+from rest_framework import status
+from rest_framework.response import Response
+
+from common.cache import WRITE_BEHIND_REQUEST_WAIT
+from common.permissions import get_accessible_q
+from common.serializers import BulkOutcomeSerializer
+from common.user_state import UserStateLoader
+from common.write_behind import WriteBehindBuffer
+
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Type
+    from django.db.models import Model, QuerySet
+    from rest_framework.serializers import Serializer
+    from common.access_chain import AccessibleChain
+
+
+class UserStateMixin:
+    def get_serializer(
+        self, instance: Any = None, *args: Any, **kwargs: Any
+    ) -> Serializer:
+        if instance is not None:
+            if kwargs.get("many"):
+                # Evaluated once, for both the loader and the serializer
+                instance = list(instance)
+                objects = instance
+            else:
+                objects = [instance]
+            kwargs["context"] = self.get_user_state_context(
+                self.get_user_state_objects(objects)
+            )
+        return super().get_serializer(instance, *args, **kwargs)
+
+    def get_user_state_objects(self, objects: list[Model]) -> Iterable[Model]:
+        return objects
+
+    def get_user_state_context(self, objects: Iterable[Model]) -> dict[str, Any]:
+        context = self.get_serializer_context()
+        context["user_state"] = UserStateLoader(self.request.user).add(objects)
+        return context
+
+
+class BulkRelationMixin:
+    # Viewsets list the chain links that grant access to their objects
+    bulk_access_links: list[Type[AccessibleChain]] = []
+
+    def get_bulk_queryset(self) -> QuerySet:
+        qs = self.get_queryset().model._default_manager.all()
+        if self.request.user.is_staff:
+            return qs
+        return qs.filter(get_accessible_q(self.request, self.bulk_access_links))
+
+    def get_accessible_ids(self, ids: list[int]) -> set[int]:
+        return set(
+            self.get_bulk_queryset().filter(pk__in=ids).values_list("pk", flat=True)
+        )
+
+    def get_bulk_filter(self, ids: Iterable[int]) -> dict[str, Any]:
+        model = self.get_queryset().model
+        return {
+            "user": self.request.user,
+            "content_type": ContentType.objects.get_for_model(model),
+            "object_id__in": ids,
+        }
+
+    def build_relations(
+        self, ids: Iterable[int], values: dict[int, dict[str, Any]] | None = None
+    ) -> list[Model]:
+        model = self.get_relation_model()
+        content_type = ContentType.objects.get_for_model(self.get_queryset().model)
+        return [
+            model(
+                user=self.request.user,
+                content_type=content_type,
+                object_id=pk,
+                **(values[pk] if values else {}),
+            )
+            for pk in ids
+        ]
+
+    def flush_buffered_writes(self) -> bool:
+        # Bulk writes go straight to the database, after earlier single ones.
+        # False while a running flush holds those past the request's wait
+        buffer = WriteBehindBuffer.connect(self.get_relation_model())
+        if buffer is None:
+            return True
+        try:
+            flushed = buffer.flush_user(
+                self.request.user.pk, wait=WRITE_BEHIND_REQUEST_WAIT
+            )
+        except RedisError:
+            return True
+        return flushed is not None
+
+    def buffer_bulk_changes(
+        self, changes: dict[int, dict[str, Any] | None]
+    ) -> set[int] | None:
+        # Queued behind the unflushed changes, so the last one still wins.
+        # Returns the ids that had a row before, None if nothing was buffered
+        model = self.get_relation_model()
+        buffer = WriteBehindBuffer.connect(model)
+        if buffer is None:
+            return None
+        content_type_id = ContentType.objects.get_for_model(
+            self.get_queryset().model
+        ).id
+        user_id = self.request.user.pk
+        ids = list(changes)
+        buffered = buffer.changes(model, user_id, content_type_id, ids)
+        existing = {pk for pk, values in buffered.items() if values is not None}
+        existing.update(
+            model.objects.filter(**self.get_bulk_filter(ids))
+            .exclude(object_id__in=buffered)
+            .values_list("object_id", flat=True)
+        )
+        if not buffer.record_many(model, user_id, content_type_id, changes):
+            return None
+        return existing
+
+    @staticmethod
+    def bulk_response(ids: list[int], outcomes: dict[int, str]) -> Response:
+        results = [
+            {
+                "id": pk,
+                "status": outcomes.get(pk, BulkOutcomeSerializer.Status.NOT_FOUND),
+            }
+            for pk in ids
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import DatabaseError, transaction
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError, ResponseError, WatchError
+
+from common.cache import (
+    WRITE_BEHIND_DIRTY_KEY,
+    WRITE_BEHIND_FLUSH_BATCH,
+    WRITE_BEHIND_FLUSHING_KEY,
+    WRITE_BEHIND_LOCK_KEY,
+    WRITE_BEHIND_LOCK_TIMEOUT,
+    WRITE_BEHIND_MAX_LAG,
+    WRITE_BEHIND_PENDING_KEY,
+    WRITE_BEHIND_QUEUED_KEY,
+)
+
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Type
+    from django.db.models import Model
+    from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+# High-frequency relations whose writes may be deferred to the flusher
+BUFFERED_RELATIONS = {"interactions.Save", "interactions.Pin", "generic_status.Learn"}
+
+
+class WriteBehindBuffer:
+    # Per user hashes of "<label>:<content type>:<object>" -> JSON values,
+    # null for a removed row. The last change to a key wins.
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+
+    @classmethod
+    def connect(cls, model: Type[Model] | None = None) -> WriteBehindBuffer | None:
+        if not settings.WRITE_BEHIND_INTERACTIONS:
+            return None
+        if model is not None and model._meta.label not in BUFFERED_RELATIONS:
+            return None
+        try:
+            return cls(get_redis_connection("default"))
+        except NotImplementedError:
+            return None
+
+    @staticmethod
+    def field(model: Type[Model], content_type_id: int, object_id: int) -> str:
+        return f"{model._meta.label}:{content_type_id}:{object_id}"
+
+    def record(
+        self,
+        model: Type[Model],
+        user_id: int,
+        content_type_id: int,
+        object_id: int,
+        values: dict[str, Any] | None,
+    ) -> bool:
+        return self.record_many(model, user_id, content_type_id, {object_id: values})
+
+    def record_many(
+        self,
+        model: Type[Model],
+        user_id: int,
+        content_type_id: int,
+        changes: dict[int, dict[str, Any] | None],
+    ) -> bool:
+        # False means the caller has to write synchronously
+        if not changes:
+            return True
+        pipe = self.redis.pipeline()
+        pipe.hset(
+            WRITE_BEHIND_PENDING_KEY.format(user_id=user_id),
+            mapping={
+                self.field(model, content_type_id, object_id): json.dumps(values)
+                for object_id, values in changes.items()
+            },
+        )
+        pipe.zadd(WRITE_BEHIND_DIRTY_KEY, {user_id: time.time()}, nx=True)
+        pipe.zscore(WRITE_BEHIND_DIRTY_KEY, user_id)
+        try:
+            *_, since = pipe.execute()
+            if since is not None and time.time() - since > WRITE_BEHIND_MAX_LAG:
+                self.queue_flush(user_id)
+        except RedisError:
+            return False
+        return True
+
+    def queue_flush(self, user_id: int) -> None:
+        from common.tasks import flush_write_behind_user
+
+        # The periodic flusher is behind, this user's changes get a task of
+        # their own instead of being written by the request that noticed
+        key = WRITE_BEHIND_QUEUED_KEY.format(user_id=user_id)
+        if self.redis.set(key, 1, nx=True, ex=WRITE_BEHIND_MAX_LAG):
+            flush_write_behind_user.delay(user_id)
+
+    def changes(
+        self,
+        model: Type[Model],
+        user_id: int,
+        content_type_id: int,
+        object_ids: Iterable[int] | None = None,
+    ) -> dict[int, dict[str, Any] | None]:
+        keys = (
+            WRITE_BEHIND_FLUSHING_KEY.format(user_id=user_id),
+            WRITE_BEHIND_PENDING_KEY.format(user_id=user_id),
+        )
+        prefix = self.field(model, content_type_id, 0)[:-1]
+        pipe = self.redis.pipeline(transaction=False)
+        if object_ids is None:
+            for key in keys:
+                pipe.hgetall(key)
+        else:
+            fields = [prefix + str(pk) for pk in object_ids]
+            if not fields:
+                return {}
+            for key in keys:
+                pipe.hmget(key, fields)
+        try:
+            buffers = pipe.execute()
+        except RedisError:
+            return {}
+
+        # Pending changes are newer than the ones being flushed
+        changes = {}
+        for buffer in buffers:
+            items = buffer.items() if object_ids is None else zip(fields, buffer)
+            for field, value in items:
+                field = field.decode() if isinstance(field, bytes) else field
+                if value is not None and field.startswith(prefix):
+                    changes[int(field[len(prefix) :])] = json.loads(value)
+        return changes
+
+    def flush(self, limit: int = WRITE_BEHIND_FLUSH_BATCH) -> int:
+        flushed = 0
+        for user_id in self.redis.zrange(WRITE_BEHIND_DIRTY_KEY, 0, limit - 1):
+            try:
+                flushed += self.flush_user(int(user_id)) or 0
+            except DatabaseError:
+                # One user's failing changes must not hold back everyone else's
+                logger.exception("Flushing buffered writes of user %s failed", user_id)
+        return flushed
+
+    def flush_user(self, user_id: int, wait: float = 0) -> int | None:
+        # None when another flush of the user's changes holds them past wait
+        lock = self.redis.lock(
+            WRITE_BEHIND_LOCK_KEY.format(user_id=user_id),
+            timeout=WRITE_BEHIND_LOCK_TIMEOUT,
+        )
+        if not lock.acquire(blocking=wait > 0, blocking_timeout=wait or None):
+            return None
+        try:
+            return self._flush_user(user_id)
+        finally:
+            lock.release()
+
+    def _flush_user(self, user_id: int) -> int:
+        pending = WRITE_BEHIND_PENDING_KEY.format(user_id=user_id)
+        flushing = WRITE_BEHIND_FLUSHING_KEY.format(user_id=user_id)
+
+        # Leftovers of an interrupted flush are older than anything pending
+        flushed = self.apply(user_id, self.redis.hgetall(flushing))
+        self.redis.delete(flushing)
+        try:
+            pipe = self.redis.pipeline()
+            pipe.renamenx(pending, flushing)
+            pipe.zadd(WRITE_BEHIND_DIRTY_KEY, {user_id: time.time()}, xx=True)
+            pipe.execute()
+        except ResponseError:
+            pass
+        flushed += self.apply(user_id, self.redis.hgetall(flushing))
+
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(pending)
+                clean = not pipe.exists(pending)
+                pipe.multi()
+                pipe.delete(flushing)
+                if clean:
+                    pipe.zrem(WRITE_BEHIND_DIRTY_KEY, user_id)
+                pipe.execute()
+            except WatchError:
+                self.redis.delete(flushing)
+        return flushed
+
+    @staticmethod
+    def apply(user_id: int, entries: dict[bytes, bytes]) -> int:
+        user_model = apps.get_model(settings.AUTH_USER_MODEL)
+        if not entries or not user_model.objects.filter(pk=user_id).exists():
+            # Changes of deleted users have nothing left to apply to
+            return 0
+
+        upserts = defaultdict(dict)
+        deletes = defaultdict(list)
+        for field, value in entries.items():
+            label, content_type_id, object_id = field.decode().rsplit(":", 2)
+            key = (label, int(content_type_id))
+            values = json.loads(value)
+            if values is None:
+                deletes[key].append(int(object_id))
+            else:
+                upserts[key][int(object_id)] = values
+
+        # Objects deleted since a change was recorded get no rows back
+        for (label, content_type_id), rows in upserts.items():
+            target = ContentType.objects.get_for_id(content_type_id).model_class()
+            alive = set()
+            if target is not None:
+                alive = set(
+                    target._base_manager.filter(pk__in=rows).values_list(
+                        "pk", flat=True
+                    )
+                )
+            upserts[label, content_type_id] = {
+                object_id: values
+                for object_id, values in rows.items()
+                if object_id in alive
+            }
+
+        with transaction.atomic():
+            for (label, content_type_id), object_ids in deletes.items():
+                apps.get_model(label).objects.filter(
+                    user_id=user_id,
+                    content_type_id=content_type_id,
+                    object_id__in=object_ids,
+                ).delete()
+            for (label, content_type_id), rows in upserts.items():
+                if not rows:
+                    continue
+                model = apps.get_model(label)
+                update_fields = list(next(iter(rows.values())))
+                model.objects.bulk_create(
+                    [
+                        model(
+                            user_id=user_id,
+                            content_type_id=content_type_id,
+                            object_id=object_id,
+                            **values,
+                        )
+                        for object_id, values in rows.items()
+                    ],
+                    ignore_conflicts=not update_fields,
+                    update_conflicts=bool(update_fields),
+                    unique_fields=(
+                        ["user", "content_type", "object_id"] if update_fields else None
+                    ),
+                    update_fields=update_fields or None,
+                )
+        return len(entries)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from django.contrib import admin
-from django.db.models import Count, Prefetch
+from django.db.models import Prefetch
 
 from modules.models import Module
 from .models import Folder
@@ -44,11 +44,11 @@ class FolderModulesInline(admin.TabularInline):
 
 @admin.register(Folder)
 class FolderAdmin(admin.ModelAdmin):
-    list_display = ("name", "user", "modules_count")
+    list_display = ("name", "user", "public_modules_count")
     search_fields = ("name",)
     list_filter = ("user",)
     ordering = ("name",)
-    readonly_fields = ("modules_count",)
+    readonly_fields = ("public_modules_count",)
     raw_id_fields = ("user",)
     list_per_page = 50
     inlines = [FolderModulesInline]
@@ -61,8 +61,4 @@ class FolderAdmin(admin.ModelAdmin):
                 queryset=Module.objects.only("id", "name"),
                 to_attr="prefetched_modules",
             )
-        ).annotate(modules_count=Count("modules", distinct=True))
-
-    @admin.display(description="Modules Count", ordering="modules_count")
-    def modules_count(self, obj) -> int:
-        return obj.modules_count
+        )
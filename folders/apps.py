@@ -6,6 +6,7 @@ class FoldersConfig(AppConfig):
     name = "folders"
 
     def ready(self) -> None:
+        import folders.signals  # noqa
         from folders import policies
         from folders.views import FolderViewSet
 
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:33
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_modules_count(apps, schema_editor):
+    Folder = apps.get_model("folders", "Folder")
+    Module = apps.get_model("modules", "Module")
+
+    modules = (
+        Module.folders.through.objects.filter(folder_id=OuterRef("pk"))
+        .order_by()
+        .values("folder_id")
+        .annotate(value=Count("id"))
+        .values("value")
+    )
+    Folder.objects.update(
+        modules_count=Coalesce(Subquery(modules, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("folders", "0002_folder_visible"),
+        ("modules", "0007_module_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="folder",
+            name="modules_count",
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(fill_modules_count, migrations.RunPython.noop),
+    ]
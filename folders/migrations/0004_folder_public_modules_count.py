@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:05
+
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_modules_count(apps, schema_editor, **filters):
+    Folder = apps.get_model("folders", "Folder")
+    Module = apps.get_model("modules", "Module")
+
+    modules = (
+        Module.folders.through.objects.filter(folder_id=OuterRef("pk"), **filters)
+        .order_by()
+        .values("folder_id")
+        .annotate(value=Count("id"))
+        .values("value")
+    )
+    Folder.objects.update(
+        public_modules_count=Coalesce(Subquery(modules, output_field=IntegerField()), 0)
+    )
+
+
+def fill_public_modules_count(apps, schema_editor):
+    fill_modules_count(apps, schema_editor, module__visible="public")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("folders", "0003_folder_modules_count"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="folder",
+            old_name="modules_count",
+            new_name="public_modules_count",
+        ),
+        migrations.RunPython(fill_public_modules_count, fill_modules_count),
+    ]
@@ -24,6 +24,10 @@ class Folder(Visible, Savable, Pinnable, models.Model):
             )
         ],
     )
+    # Only public modules are stored, each viewer's own are added per request
+    public_modules_count = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True
+    )
 
     class Meta:
         ordering = ["name"]
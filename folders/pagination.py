@@ -1,7 +1,9 @@
 from rest_framework.pagination import PageNumberPagination
 
+from common.pagination import FastCountMixin, KeysetModeMixin
 
-class FolderPagination(PageNumberPagination):
+
+class FolderPagination(KeysetModeMixin, FastCountMixin, PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
-    max_page_size = 50
\ No newline at end of file
+    max_page_size = 50
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from django.db.models import Count, Q, Prefetch
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 
 from common.permissions import get_accessible_q
 from folders.models import Folder
@@ -13,7 +14,6 @@ if TYPE_CHECKING:
     from rest_framework.request import Request
     from typing import Type
     from common.access_chain import AccessibleChain
-    from users.models import User
 
 
 class FolderRepository:
@@ -26,12 +26,20 @@ class FolderRepository:
         qs: QuerySet[Folder],
         modules_q: Q,
     ) -> QuerySet[Folder]:
-        return qs.annotate(
-            modules_count=Count(
-                "modules",
-                filter=Q(modules__in=Module.objects.filter(modules_q)),
-                distinct=True,
+        # The stored public count plus the other modules the viewer can see
+        hidden = Module.objects.filter(modules_q).exclude(visible=Module.Status.PUBLIC)
+        hidden_count = (
+            Module.folders.through.objects.filter(
+                folder_id=OuterRef("pk"), module__in=hidden
             )
+            .order_by()
+            .values("folder_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return qs.annotate(
+            modules_count=F("public_modules_count")
+            + Coalesce(Subquery(hidden_count, output_field=IntegerField()), 0)
         )
 
     @staticmethod
@@ -45,20 +53,13 @@ class FolderRepository:
     @staticmethod
     def with_modules_prefetched(
         qs: QuerySet[Folder],
-        user: User,
         modules_q: Q,
     ) -> QuerySet[Folder]:
-        return (
-            qs.prefetch_related(
-                Prefetch(
-                    "modules",
-                    queryset=Module.objects.filter(modules_q)
-                    .select_related("user", "topic", "lang_from", "lang_to")
-                    .with_ann_saved(user)
-                    .with_ann_pinned(user)
-                    .with_ann_perm(user),
-                )
+        return qs.prefetch_related(
+            Prefetch(
+                "modules",
+                queryset=Module.objects.filter(modules_q).select_related(
+                    "user", "topic", "lang_from", "lang_to"
+                ),
             )
-            .with_ann_saved(user)
-            .with_ann_pinned(user)
         )
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from common.user_state import UserStateBooleanField, UserStateCharField
 from languages.serializers import LanguageShortSerializer
 from modules.models import Module
 from topics.serializers import TopicSerializer
@@ -16,7 +17,9 @@ class FolderCreateUpdateSerializer(serializers.ModelSerializer):
 
 class FolderListSerializer(serializers.ModelSerializer):
     user = UserPublicSerializer(read_only=True)
-    modules_count = serializers.IntegerField(read_only=True)
+    modules_count = serializers.IntegerField(
+        read_only=True, help_text="Modules in the folder that the caller can see."
+    )
 
     class Meta:
         model = Folder
@@ -31,10 +34,10 @@ class FolderModuleListSerializer(serializers.ModelSerializer):
 
     cards_count = serializers.IntegerField(read_only=True)
 
-    saved = serializers.BooleanField()
-    pinned = serializers.BooleanField()
+    saved = UserStateBooleanField()
+    pinned = UserStateBooleanField()
 
-    user_perm = serializers.CharField()
+    user_perm = UserStateCharField()
 
     class Meta:
         model = Module
@@ -54,11 +57,13 @@ class FolderModuleListSerializer(serializers.ModelSerializer):
 
 
 class FolderDetailSerializer(serializers.ModelSerializer):
-    modules_count = serializers.IntegerField(read_only=True)
+    modules_count = serializers.IntegerField(
+        read_only=True, help_text="Modules in the folder that the caller can see."
+    )
     modules = FolderModuleListSerializer(many=True, read_only=True)
 
-    saved = serializers.BooleanField()
-    pinned = serializers.BooleanField()
+    saved = UserStateBooleanField()
+    pinned = UserStateBooleanField()
 
     class Meta:
         model = Folder
@@ -30,23 +30,22 @@ class FolderService:
         self.action = action
 
     def get_queryset(self) -> QuerySet[Folder]:
-        base_qs = FolderRepository.base_qs()
-
-        if self.action not in {"list", "retrieve"}:
-            return base_qs
-
         modules_q = get_accessible_q(
             self.request, ModuleService.LIST_ACTION_CHAIN_LINKS
         )
-        qs = FolderRepository.with_modules_count(base_qs, modules_q)
-        user = self.request.user
+        base_qs = FolderRepository.with_modules_count(
+            FolderRepository.base_qs(), modules_q
+        )
+
+        if self.action not in {"list", "retrieve"}:
+            return base_qs
 
         if self.action == "list":
             return FolderRepository.accessible_for_user(
-                qs, self.request, self.LIST_ACTION_CHAIN_LINKS
+                base_qs, self.request, self.LIST_ACTION_CHAIN_LINKS
             )
 
         if self.action == "retrieve":
-            return FolderRepository.with_modules_prefetched(qs, user, modules_q)
+            return FolderRepository.with_modules_prefetched(base_qs, modules_q)
 
         return base_qs
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import models
+from django.db.models.signals import (
+    m2m_changed,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from folders.models import Folder
+from modules.models import Module
+
+if TYPE_CHECKING:
+    from typing import Any, Type
+    from django.db.models import Model, QuerySet
+
+
+def add_modules_count(folders: QuerySet[Folder], count: int) -> None:
+    folders.update(public_modules_count=models.F("public_modules_count") + count)
+
+
+def is_counted(module: Module) -> bool:
+    # Folders count the visibility that was saved, not one edited in memory
+    visible = getattr(module, "_saved_visible", None)
+    if visible is None:
+        return Module.objects.filter(
+            pk=module.pk, visible=Module.Status.PUBLIC
+        ).exists()
+    return visible == Module.Status.PUBLIC
+
+
+@receiver(m2m_changed, sender=Module.folders.through)
+def count_folder_modules(
+    sender: Type[Model],
+    instance: Model,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs: Any,
+) -> None:
+    # Removals are counted before the rows go, so that ids which were
+    # never linked are left out
+    if reverse:
+        folders = Folder.objects.filter(pk=instance.pk)
+        public = Module.objects.filter(visible=Module.Status.PUBLIC)
+        if action == "post_add":
+            add_modules_count(folders, public.filter(pk__in=pk_set).count())
+        elif action == "pre_remove":
+            removed = sender.objects.filter(
+                folder=instance, module_id__in=pk_set, module__in=public
+            )
+            add_modules_count(folders, -removed.count())
+        elif action == "pre_clear":
+            folders.update(public_modules_count=0)
+    elif action not in {"post_add", "pre_remove", "pre_clear"}:
+        return
+    elif not is_counted(instance):
+        return
+    elif action == "post_add":
+        add_modules_count(Folder.objects.filter(pk__in=pk_set), 1)
+    elif action == "pre_remove":
+        add_modules_count(Folder.objects.filter(pk__in=pk_set, modules=instance), -1)
+    elif action == "pre_clear":
+        add_modules_count(Folder.objects.filter(modules=instance), -1)
+
+
+@receiver(post_init, sender=Module)
+def remember_module_visibility(
+    sender: Type[Model], instance: Module, **kwargs: Any
+) -> None:
+    # Read without loading a deferred field
+    instance._saved_visible = instance.__dict__.get("visible")
+
+
+@receiver(pre_save, sender=Module)
+def load_module_visibility(
+    sender: Type[Model], instance: Module, **kwargs: Any
+) -> None:
+    if not instance._state.adding and instance._saved_visible is None:
+        instance._saved_visible = (
+            Module.objects.filter(pk=instance.pk)
+            .values_list("visible", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Module)
+def count_module_visibility(
+    sender: Type[Model],
+    instance: Module,
+    created: bool,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    if update_fields is not None and "visible" not in update_fields:
+        return
+    # A new module is in no folder yet
+    was_public = not created and instance._saved_visible == Module.Status.PUBLIC
+    instance._saved_visible = instance.visible
+    is_public = instance.visible == Module.Status.PUBLIC
+    if was_public != is_public:
+        add_modules_count(
+            Folder.objects.filter(modules=instance), 1 if is_public else -1
+        )
+
+
+# Deletes cascade to the auto-created through table without any signals
+@receiver(pre_delete, sender=Module)
+def count_deleted_module(sender: Type[Model], instance: Module, **kwargs: Any) -> None:
+    if is_counted(instance):
+        add_modules_count(Folder.objects.filter(modules=instance), -1)
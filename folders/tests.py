@@ -0,0 +1,63 @@
+from rest_framework.test import APITestCase
+
+from folders.models import Folder
+from languages.models import Language
+from modules.models import Module
+from topics.models import Topic
+from users.models import User
+
+
+class FolderModulesCountTests(APITestCase):
+    def setUp(self) -> None:
+        self.owner = User.objects.create(username="owner", email="owner@x.io")
+        topic = Topic.objects.create(name="General")
+        en = Language.objects.create(code="EN", name="English")
+        de = Language.objects.create(code="DE", name="German")
+        self.public, self.private = (
+            Module.objects.create(
+                name=visible,
+                user=self.owner,
+                topic=topic,
+                lang_from=en,
+                lang_to=de,
+                visible=visible,
+            )
+            for visible in (Module.Status.PUBLIC, Module.Status.PRIVATE)
+        )
+        self.folder = Folder.objects.create(
+            name="Folder", user=self.owner, color="#A1B2C3"
+        )
+        self.folder.modules.add(self.public, self.private)
+
+    def retrieve(self, user: User | None = None) -> dict:
+        if user is not None:
+            self.client.force_authenticate(user)
+        response = self.client.get(f"/api/v1/folders/{self.folder.pk}/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_only_public_modules_are_stored(self) -> None:
+        self.folder.refresh_from_db()
+        self.assertEqual(self.folder.public_modules_count, 1)
+
+    def test_count_matches_the_modules_the_caller_sees(self) -> None:
+        stranger = User.objects.create(username="stranger", email="stranger@x.io")
+        for user, count in ((None, 1), (stranger, 1), (self.owner, 2)):
+            data = self.retrieve(user)
+            self.assertEqual(data["modules_count"], count)
+            self.assertEqual(len(data["modules"]), count)
+
+    def test_visibility_changes_update_the_count(self) -> None:
+        self.private.visible = Module.Status.PUBLIC
+        self.private.save()
+        self.folder.refresh_from_db()
+        self.assertEqual(self.folder.public_modules_count, 2)
+
+        self.public.visible = Module.Status.PRIVATE
+        self.public.save(update_fields=["visible"])
+        self.folder.refresh_from_db()
+        self.assertEqual(self.folder.public_modules_count, 1)
+
+        self.private.delete()
+        self.folder.refresh_from_db()
+        self.assertEqual(self.folder.public_modules_count, 0)
@@ -17,6 +17,7 @@ from abstracts.views import VisibleMixin
 from common.decorators import swagger_safe_permissions
 from common.exeptions import UnRegisteredPolicy
 from common.policy import PolicyRegistry
+from common.views import UserStateMixin
 from folders.pagination import FolderPagination
 from folders.serializers import (
     FolderListSerializer,
@@ -29,7 +30,7 @@ from modules.models import Module
 from .filters import FolderFilter
 
 if TYPE_CHECKING:
-    from django.db.models import QuerySet
+    from django.db.models import Model, QuerySet
     from typing import Optional, Type
     from rest_framework.permissions import BasePermission
     from rest_framework.serializers import Serializer, ModelSerializer
@@ -38,12 +39,15 @@ if TYPE_CHECKING:
 
 
 @extend_schema(tags=["folders"])
-class FolderViewSet(PinMixin, SaveMixin, VisibleMixin, viewsets.ModelViewSet):
+class FolderViewSet(
+    UserStateMixin, PinMixin, SaveMixin, VisibleMixin, viewsets.ModelViewSet
+):
     filter_backends = [DjangoFilterBackend]
     filterset_class = FolderFilter
     pagination_class = FolderPagination
     saves_serializer_class = FolderListSerializer
     pins_serializer_class = FolderListSerializer
+    bulk_access_links = FolderService.LIST_ACTION_CHAIN_LINKS
     policies = PolicyRegistry()
 
     def get_queryset(self) -> QuerySet[Folder]:
@@ -73,6 +77,11 @@ class FolderViewSet(PinMixin, SaveMixin, VisibleMixin, viewsets.ModelViewSet):
     def perform_create(self, serializer: ModelSerializer) -> None:
         serializer.save(user=self.request.user)
 
+    def get_user_state_objects(self, objects: list[Folder]) -> list[Model]:
+        if self.action == "retrieve":
+            return [*objects, *objects[0].modules.all()]
+        return objects
+
     @extend_schema(
         methods=["POST"],
         tags=["folders"],
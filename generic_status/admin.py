@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 
 from django.contrib import admin
 
-from generic_status.models import Learn, Rate, Perm
+from generic_status.models import Learn, Rate, Perm, Review
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -34,3 +34,9 @@ class RateAdmin(RelatedAdminBase):
 @admin.register(Perm)
 class PermAdmin(RelatedAdminBase):
     list_filter = ("perm", "user")
+
+
+@admin.register(Review)
+class ReviewAdmin(RelatedAdminBase):
+    list_display = ("user", "content_type", "object_id", "due_at", "interval")
+    list_filter = ("user",)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GenericStatusConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "generic_status"
+
+    def ready(self) -> None:
+        import generic_status.signals  # noqa
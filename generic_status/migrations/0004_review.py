@@ -0,0 +1,61 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("generic_status", "0003_alter_perm_unique_together"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Review",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                ("interval", models.PositiveIntegerField(default=0)),
+                ("ease", models.FloatField(default=2.5)),
+                ("repetitions", models.PositiveIntegerField(default=0)),
+                ("due_at", models.DateTimeField()),
+                ("reviewed_at", models.DateTimeField()),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)ss",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "content_type", "due_at"],
+                        name="generic_sta_user_id_307e55_idx",
+                    )
+                ],
+                "unique_together": {("user", "content_type", "object_id")},
+            },
+        ),
+    ]
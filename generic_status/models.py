@@ -34,6 +34,27 @@ class Perm(UserObjectRelation):
         unique_together = ("user", "content_type", "object_id")
 
 
+class Review(UserObjectRelation):
+    class Grade(models.IntegerChoices):
+        BLACKOUT = 0, "Blackout"
+        WRONG = 1, "Wrong"
+        HARD_WRONG = 2, "Wrong, but familiar"
+        HARD = 3, "Hard"
+        GOOD = 4, "Good"
+        EASY = 5, "Easy"
+
+    interval = models.PositiveIntegerField(default=0)
+    ease = models.FloatField(default=2.5)
+    repetitions = models.PositiveIntegerField(default=0)
+    due_at = models.DateTimeField()
+    reviewed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("user", "content_type", "object_id")
+        # The due queue of a user is a range scan of this index
+        indexes = [models.Index(fields=["user", "content_type", "due_at"])]
+
+
 class Learnable(models.Model):
     learns = GenericRelation("generic_status.Learn")
 
@@ -41,9 +62,19 @@ class Learnable(models.Model):
         abstract = True
 
 
+class Reviewable(models.Model):
+    reviews = GenericRelation("generic_status.Review")
+
+    class Meta:
+        abstract = True
+
+
 class Rateable(models.Model):
     rates = GenericRelation("generic_status.Rate")
 
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         abstract = True
 
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from generic_status.models import Review
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from typing import Any
+
+DUE_REVIEWS_LIMIT = 20
+DUE_REVIEWS_MAX_LIMIT = 200
+MIN_EASE = 1.3
+# Intervals in days of the first two successful repetitions
+FIRST_INTERVALS = (1, 6)
+
+
+def schedule_review(
+    interval: int, ease: float, repetitions: int, grade: int, now: datetime
+) -> dict[str, Any]:
+    # SM-2: a failed recall restarts the repetitions, the ease factor
+    # follows every grade
+    if grade < Review.Grade.HARD:
+        repetitions = 0
+        interval = FIRST_INTERVALS[0]
+    else:
+        repetitions += 1
+        if repetitions <= len(FIRST_INTERVALS):
+            interval = FIRST_INTERVALS[repetitions - 1]
+        else:
+            interval = round(interval * ease)
+
+    miss = Review.Grade.EASY - grade
+    ease = max(MIN_EASE, ease + 0.1 - miss * (0.08 + miss * 0.02))
+    return {
+        "interval": interval,
+        "ease": round(ease, 4),
+        "repetitions": repetitions,
+        "due_at": now + timedelta(days=interval),
+        "reviewed_at": now,
+    }
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
-from generic_status.models import Learn, Rate, Perm
+from common.serializers import BULK_MAX_SIZE, BulkItemsSerializer
+from generic_status.models import Learn, Rate, Perm, Review
+from generic_status.scheduling import DUE_REVIEWS_LIMIT, DUE_REVIEWS_MAX_LIMIT
 from users.models import User
 from users.serializers import UserPublicSerializer
 
@@ -13,6 +15,37 @@ class RateSerializer(serializers.Serializer):
     rate = serializers.ChoiceField(choices=Rate.Status.choices)
 
 
+class LearnItemSerializer(LearnSerializer):
+    id = serializers.IntegerField(min_value=1)
+
+
+class BulkLearnSerializer(BulkItemsSerializer):
+    items = LearnItemSerializer(many=True, min_length=1, max_length=BULK_MAX_SIZE)
+
+
+class RateItemSerializer(RateSerializer):
+    id = serializers.IntegerField(min_value=1)
+
+
+class BulkRateSerializer(BulkItemsSerializer):
+    items = RateItemSerializer(many=True, min_length=1, max_length=BULK_MAX_SIZE)
+
+
+class ReviewItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    grade = serializers.ChoiceField(choices=Review.Grade.choices)
+
+
+class BulkReviewSerializer(BulkItemsSerializer):
+    items = ReviewItemSerializer(many=True, min_length=1, max_length=BULK_MAX_SIZE)
+
+
+class DueReviewsQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(
+        min_value=1, max_value=DUE_REVIEWS_MAX_LIMIT, default=DUE_REVIEWS_LIMIT
+    )
+
+
 class PermSerializer(serializers.Serializer):
     perm = serializers.ChoiceField(choices=Perm.Status.choices)
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
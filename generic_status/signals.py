@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import models
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import Signal, receiver
+
+from generic_status.models import Rate, Rateable
+
+if TYPE_CHECKING:
+    from typing import Any, Type
+    from django.db.models import Model
+
+
+# Sent with the rated model and the object_ids whose rating counters moved
+ratings_changed = Signal()
+
+
+def update_rating(instance: Rate, **changes: Any) -> None:
+    model = instance.content_type.model_class()
+    if model is not None and issubclass(model, Rateable):
+        model._base_manager.filter(pk=instance.object_id).update(**changes)
+        ratings_changed.send(sender=model, object_ids=[instance.object_id])
+
+
+def bulk_update_rating(model: Type[Model], changes: dict[int, tuple[int, int]]) -> None:
+    # Applies (sum, count) deltas for many rated objects in one UPDATE
+    def delta(index: int) -> models.Case:
+        return models.Case(
+            *(
+                models.When(pk=pk, then=models.Value(change[index]))
+                for pk, change in changes.items()
+            ),
+            default=models.Value(0),
+        )
+
+    if changes:
+        model._base_manager.filter(pk__in=changes).update(
+            rating_sum=models.F("rating_sum") + delta(0),
+            rating_count=models.F("rating_count") + delta(1),
+        )
+        ratings_changed.send(sender=model, object_ids=list(changes))
+
+
+@receiver(post_init, sender=Rate)
+def remember_rate(sender: Type[Model], instance: Rate, **kwargs: Any) -> None:
+    instance._saved_rate = instance.rate if instance.pk else None
+
+
+@receiver(post_save, sender=Rate)
+def count_saved_rate(
+    sender: Type[Model], instance: Rate, created: bool, **kwargs: Any
+) -> None:
+    if created:
+        update_rating(
+            instance,
+            rating_sum=models.F("rating_sum") + instance.rate,
+            rating_count=models.F("rating_count") + 1,
+        )
+    elif instance.rate != instance._saved_rate:
+        update_rating(
+            instance,
+            rating_sum=models.F("rating_sum") + instance.rate - instance._saved_rate,
+        )
+    instance._saved_rate = instance.rate
+
+
+@receiver(post_delete, sender=Rate)
+def count_deleted_rate(sender: Type[Model], instance: Rate, **kwargs: Any) -> None:
+    # Rates deleted together with the rated object have nothing to update
+    origin = kwargs.get("origin")
+    if isinstance(origin, models.QuerySet):
+        origin_model = origin.model
+    else:
+        origin_model = type(origin)
+    if origin_model is instance.content_type.model_class():
+        return
+    update_rating(
+        instance,
+        rating_sum=models.F("rating_sum") - instance._saved_rate,
+        rating_count=models.F("rating_count") - 1,
+    )
@@ -3,30 +3,63 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema
 from rest_framework import status, permissions
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 from common.permissions import IsObjOwner, IsObjAdmin
-from generic_status.models import Learn, Rate, Perm
+from common.serializers import (
+    BulkIdsSerializer,
+    BulkOutcomeSerializer,
+    BulkResultSerializer,
+)
+from common.views import BulkRelationMixin
+from common.write_behind import WriteBehindBuffer
+from generic_status.models import Learn, Rate, Perm, Review
+from generic_status.scheduling import schedule_review
 from generic_status.serializers import (
+    BulkLearnSerializer,
+    BulkRateSerializer,
+    BulkReviewSerializer,
+    DueReviewsQuerySerializer,
     RateSerializer,
     PermSerializer,
     LearnSerializer,
     PermListSerializer,
 )
+from generic_status.signals import bulk_update_rating
 from users.models import User
 
 if TYPE_CHECKING:
     from rest_framework.permissions import BasePermission
     from rest_framework.request import Request
     from rest_framework.serializers import Serializer
-    from django.db.models import Model
+    from django.db.models import Model, QuerySet
     from typing import Any, Optional, Type
 
 
-class BaseUserRelationMixin:
+def bulk_schema(serializer_class: Type[Serializer]) -> Any:
+    def decorate(view: Any) -> Any:
+        view = extend_schema(
+            methods=["POST"],
+            request=serializer_class,
+            responses={200: BulkResultSerializer, 400: None},
+        )(view)
+        return extend_schema(
+            methods=["DELETE"],
+            request=BulkIdsSerializer,
+            responses={200: BulkResultSerializer, 400: None},
+        )(view)
+
+    return decorate
+
+
+class BaseUserRelationMixin(BulkRelationMixin):
     def get_target_user_post(
         self,
         request: Request,
@@ -59,20 +92,35 @@ class BaseUserRelationMixin:
         data: dict,
     ):
         defaults = self.map_validated_to_defaults(data)
-        return self.get_relation_model().objects.update_or_create(
-            **self.get_queryset_filter(user, obj), defaults=defaults
-        )
+        model = self.get_relation_model()
+        lookup = self.get_queryset_filter(user, obj)
+
+        buffer = WriteBehindBuffer.connect(model)
+        if buffer is not None:
+            content_type_id = lookup["content_type"].id
+            change = buffer.changes(model, user.pk, content_type_id, [obj.pk])
+            if obj.pk in change:
+                exists = change[obj.pk] is not None
+            else:
+                exists = model.objects.filter(**lookup).exists()
+            if buffer.record(model, user.pk, content_type_id, obj.pk, defaults):
+                return None, not exists
+        return model.objects.update_or_create(**lookup, defaults=defaults)
 
     def _delete_relation(
         self,
         user: User,
         obj: Model,
     ) -> int:
-        return (
-            self.get_relation_model()
-            .objects.filter(**self.get_queryset_filter(user, obj))
-            .delete()[0]
-        )
+        model = self.get_relation_model()
+        lookup = self.get_queryset_filter(user, obj)
+
+        buffer = WriteBehindBuffer.connect(model)
+        if buffer is not None and buffer.record(
+            model, user.pk, lookup["content_type"].id, obj.pk, None
+        ):
+            return 0
+        return model.objects.filter(**lookup).delete()[0]
 
     def map_validated_to_defaults(self, validated: dict) -> dict:
         return validated
@@ -98,6 +146,78 @@ class BaseUserRelationMixin:
         self._delete_relation(user, obj)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def handle_bulk_action(self, request: Request) -> Response:
+        if request.method == "POST":
+            return self.handle_bulk_post_action(request)
+        return self.handle_bulk_delete_action(request)
+
+    def handle_bulk_post_action(self, request: Request) -> Response:
+        serializer = self.get_serializer_class()(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        values = {
+            item["id"]: self.map_validated_to_defaults(
+                {name: value for name, value in item.items() if name != "id"}
+            )
+            for item in serializer.validated_data["items"]
+        }
+        ids = list(values)
+        accessible = self.get_accessible_ids(ids)
+
+        existing = None
+        if not self.flush_buffered_writes():
+            existing = self.buffer_bulk_changes({pk: values[pk] for pk in accessible})
+        if existing is None:
+            relations = self.get_relation_model().objects
+            rows = relations.filter(**self.get_bulk_filter(accessible))
+            with transaction.atomic():
+                existing = {row.object_id: row for row in rows.select_for_update()}
+                relations.bulk_create(
+                    self.build_relations(accessible, values),
+                    update_conflicts=True,
+                    unique_fields=["user", "content_type", "object_id"],
+                    update_fields=list(values[ids[0]]),
+                )
+                self.after_bulk_write(existing, {pk: values[pk] for pk in accessible})
+
+        outcomes = {
+            pk: (
+                BulkOutcomeSerializer.Status.UPDATED
+                if pk in existing
+                else BulkOutcomeSerializer.Status.CREATED
+            )
+            for pk in accessible
+        }
+        return self.bulk_response(ids, outcomes)
+
+    def handle_bulk_delete_action(self, request: Request) -> Response:
+        serializer = BulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        existing = None
+        if not self.flush_buffered_writes():
+            existing = self.buffer_bulk_changes(dict.fromkeys(ids))
+        if existing is None:
+            rows = self.get_relation_model().objects.filter(**self.get_bulk_filter(ids))
+            with transaction.atomic():
+                existing = set(rows.values_list("object_id", flat=True))
+                rows.delete()
+
+        outcomes = {
+            pk: (
+                BulkOutcomeSerializer.Status.DELETED
+                if pk in existing
+                else BulkOutcomeSerializer.Status.ABSENT
+            )
+            for pk in ids
+        }
+        return self.bulk_response(ids, outcomes)
+
+    def after_bulk_write(
+        self, existing: dict[int, Model], values: dict[int, dict[str, Any]]
+    ) -> None:
+        pass
+
 
 class LearnMixin(BaseUserRelationMixin):
     @action(detail=True, methods=["post", "delete"])
@@ -105,25 +225,135 @@ class LearnMixin(BaseUserRelationMixin):
         self, request: Request, pk: Optional[int] = None, **kwargs: Any
     ) -> Response:
         if request.method == "POST":
-            return self.handle_post_action(request)
-        return self.handle_delete_action(request)
+            response = self.handle_post_action(request)
+        else:
+            response = self.handle_delete_action(request)
+        self.learns_changed([int(pk)])
+        return response
+
+    @bulk_schema(BulkLearnSerializer)
+    @action(detail=False, methods=["post", "delete"], url_path="learns/bulk")
+    def bulk_learns(self, request: Request, **kwargs: Any) -> Response:
+        response = self.handle_bulk_action(request)
+        self.learns_changed(
+            [
+                result["id"]
+                for result in response.data["results"]
+                if result["status"] != BulkOutcomeSerializer.Status.NOT_FOUND
+            ]
+        )
+        return response
+
+    def learns_changed(self, object_ids: list[int]) -> None:
+        # Hook for state derived from the user's learns, e.g. cached progress
+        pass
 
     def get_permissions(self) -> list[BasePermission]:
-        if self.action == "learns":
+        if self.action in {"learns", "bulk_learns"}:
             return [permissions.IsAuthenticated()]
         return super().get_permissions()
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "learns":
             return LearnSerializer
+        if self.action == "bulk_learns":
+            return BulkLearnSerializer
         return super().get_serializer_class()
 
     def get_relation_model(self) -> Type[Model]:
-        if self.action == "learns":
+        if self.action in {"learns", "bulk_learns"}:
             return Learn
         return super().get_relation_model()
 
 
+class ReviewMixin(BaseUserRelationMixin):
+    @extend_schema(parameters=[DueReviewsQuerySerializer], filters=False)
+    @action(
+        detail=False, methods=["get"], url_path="reviews/due", pagination_class=None
+    )
+    def due_reviews(self, request: Request, **kwargs: Any) -> Response:
+        params = DueReviewsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        # Walks the (user, content_type, due_at) index, however many
+        # modules the reviewed objects come from
+        objects = (
+            self.get_queryset()
+            .model._default_manager.filter(
+                reviews__user=request.user, reviews__due_at__lte=timezone.now()
+            )
+            .annotate(
+                due_at=F("reviews__due_at"),
+                interval=F("reviews__interval"),
+                ease=F("reviews__ease"),
+                repetitions=F("reviews__repetitions"),
+            )
+            .order_by("due_at")[: params.validated_data["limit"]]
+        )
+        serializer = self.get_serializer(objects, many=True)
+        return Response(serializer.data)
+
+    @bulk_schema(BulkReviewSerializer)
+    @action(detail=False, methods=["post", "delete"], url_path="reviews/bulk")
+    def bulk_reviews(self, request: Request, **kwargs: Any) -> Response:
+        return self.handle_bulk_action(request)
+
+    def handle_bulk_post_action(self, request: Request) -> Response:
+        if self.action != "bulk_reviews":
+            return super().handle_bulk_post_action(request)
+
+        serializer = BulkReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        grades = {
+            item["id"]: item["grade"] for item in serializer.validated_data["items"]
+        }
+        ids = list(grades)
+
+        accessible = self.get_accessible_ids(ids)
+        rows = Review.objects.filter(**self.get_bulk_filter(accessible))
+        now = timezone.now()
+        with transaction.atomic():
+            existing = {row.object_id: row for row in rows.select_for_update()}
+            values = {}
+            for pk in accessible:
+                review = existing.get(pk) or Review()
+                values[pk] = schedule_review(
+                    review.interval, review.ease, review.repetitions, grades[pk], now
+                )
+            if values:
+                Review.objects.bulk_create(
+                    self.build_relations(accessible, values),
+                    update_conflicts=True,
+                    unique_fields=["user", "content_type", "object_id"],
+                    update_fields=list(values[next(iter(values))]),
+                )
+
+        outcomes = {
+            pk: (
+                BulkOutcomeSerializer.Status.UPDATED
+                if pk in existing
+                else BulkOutcomeSerializer.Status.CREATED
+            )
+            for pk in accessible
+        }
+        return self.bulk_response(ids, outcomes)
+
+    def get_permissions(self) -> list[BasePermission]:
+        if self.action in {"due_reviews", "bulk_reviews"}:
+            return [permissions.IsAuthenticated()]
+        return super().get_permissions()
+
+    def get_serializer_class(self) -> Type[Serializer]:
+        if self.action == "bulk_reviews":
+            return BulkReviewSerializer
+        return super().get_serializer_class()
+
+    def get_relation_model(self) -> Type[Model]:
+        if self.action == "bulk_reviews":
+            return Review
+        return super().get_relation_model()
+
+
 class RateMixin(BaseUserRelationMixin):
     @action(detail=True, methods=["post", "delete"])
     def rates(
@@ -136,21 +366,53 @@ class RateMixin(BaseUserRelationMixin):
             return self.handle_post_action(request)
         return self.handle_delete_action(request)
 
+    @bulk_schema(BulkRateSerializer)
+    @action(detail=False, methods=["post", "delete"], url_path="rates/bulk")
+    def bulk_rates(self, request: Request, **kwargs: Any) -> Response:
+        return self.handle_bulk_action(request)
+
     def get_permissions(self) -> list[BasePermission]:
         if self.action == "rates":
             return [(~IsObjOwner)()]
+        if self.action == "bulk_rates":
+            return [permissions.IsAuthenticated()]
         return super().get_permissions()
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "rates":
             return RateSerializer
+        if self.action == "bulk_rates":
+            return BulkRateSerializer
         return super().get_serializer_class()
 
     def get_relation_model(self) -> Type[Model]:
-        if self.action == "rates":
+        if self.action in {"rates", "bulk_rates"}:
             return Rate
         return super().get_relation_model()
 
+    def get_bulk_queryset(self) -> QuerySet:
+        qs = super().get_bulk_queryset()
+        if self.action == "bulk_rates":
+            # Authors don't rate their own objects
+            qs = qs.exclude(user=self.request.user)
+        return qs
+
+    def after_bulk_write(
+        self, existing: dict[int, Model], values: dict[int, dict[str, Any]]
+    ) -> None:
+        if self.action != "bulk_rates":
+            return super().after_bulk_write(existing, values)
+        # Bulk inserts skip the signals that keep the rating counters
+        changes = {
+            pk: (
+                (value["rate"] - existing[pk].rate, 0)
+                if pk in existing
+                else (value["rate"], 1)
+            )
+            for pk, value in values.items()
+        }
+        bulk_update_rating(self.get_queryset().model, changes)
+
 
 class PermMixin(BaseUserRelationMixin):
     @action(detail=True, methods=["post"])
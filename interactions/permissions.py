@@ -6,7 +6,7 @@ from common.permissions import IsObjAdmin, IsObjOwner
 
 class InteractionsPermsMixin:
     def get_permissions(self) -> list[BasePermission]:
-        if self.action in {"pins", "saves"}:
+        if self.action in {"pins", "saves", "bulk_pins", "bulk_saves"}:
             return [permissions.IsAuthenticated()]
         if self.action in {"user_saves_list", "user_pins_list"}:
             return [permissions.IsAuthenticated(), (IsObjAdmin | IsObjOwner)()]
@@ -23,8 +23,8 @@ class AnnotatePinnedMixin:
             pinned=Exists(
                 Pin.objects.filter(
                     object_id=OuterRef("pk"),
-                    content_type__model=ContentType.objects.get_for_model(self.model),
-                    user=user
+                    content_type=ContentType.objects.get_for_model(self.model),
+                    user=user,
                 )
             )
         )
@@ -41,8 +41,8 @@ class AnnotateSavedMixin:
             saved=Exists(
                 Save.objects.filter(
                     object_id=OuterRef("pk"),
-                    content_type__model=ContentType.objects.get_for_model(self.model),
-                    user=user
+                    content_type=ContentType.objects.get_for_model(self.model),
+                    user=user,
                 )
             )
         )
\ No newline at end of file
@@ -1,5 +1,7 @@
 from drf_spectacular.utils import extend_schema
 
+from common.serializers import BulkIdsSerializer, BulkResultSerializer
+
 
 toggle_post_schema = extend_schema(
     methods=["POST"],
@@ -20,3 +22,11 @@ toggle_delete_schema = extend_schema(
         404: None,
     },
 )
+
+bulk_toggle_schema = extend_schema(
+    request=BulkIdsSerializer,
+    responses={
+        200: BulkResultSerializer,
+        400: None,
+    },
+)
@@ -3,45 +3,127 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Optional
 
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from common.serializers import BulkIdsSerializer, BulkOutcomeSerializer
+from common.views import BulkRelationMixin
+from common.write_behind import WriteBehindBuffer
 from interactions.models import Pin, Save
 from interactions.permissions import InteractionsPermsMixin
 from interactions.shemas import (
+    bulk_toggle_schema,
     toggle_post_schema,
     toggle_delete_schema,
 )
 
 if TYPE_CHECKING:
-    from django.db.models import Model
+    from django.db.models import Model, QuerySet
     from typing import Type
     from rest_framework.request import Request
 
 
-class RelationMixin:
+class RelationMixin(BulkRelationMixin):
     def toggle(
         self, request: Request, pk: Optional[int] = None, **kwargs: dict
     ) -> Response:
         obj = self.get_object()
         content_type = ContentType.objects.get_for_model(obj)
+        model = self.get_relation_model()
+        if request.method not in {"POST", "DELETE"}:
+            return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        values = {} if request.method == "POST" else None
+        buffer = WriteBehindBuffer.connect(model)
+        if buffer is None or not buffer.record(
+            model, request.user.pk, content_type.id, obj.pk, values
+        ):
+            lookup = {
+                "user": request.user,
+                "content_type": content_type,
+                "object_id": obj.pk,
+            }
+            if values is None:
+                model.objects.filter(**lookup).delete()
+            else:
+                model.objects.get_or_create(**lookup)
         if request.method == "POST":
-            self.get_relation_model().objects.get_or_create(
-                user=request.user, content_type=content_type, object_id=obj.pk
-            )
             return Response(status=status.HTTP_201_CREATED)
-        elif request.method == "DELETE":
-            self.get_relation_model().objects.filter(
-                user=request.user, content_type=content_type, object_id=obj.pk
-            ).delete()
-            return Response(status=status.HTTP_200_OK)
-        return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+        return Response(status=status.HTTP_200_OK)
+
+    def filter_related(
+        self, queryset: QuerySet, model: Type[Model], relation: str, user_id: int
+    ) -> QuerySet:
+        content_type = ContentType.objects.get_for_model(queryset.model)
+        buffer = WriteBehindBuffer.connect(model)
+        changes = {}
+        if buffer is not None and user_id == self.request.user.pk:
+            # Unflushed changes of the requesting user apply to their own list
+            changes = buffer.changes(model, user_id, content_type.id)
+        if not changes:
+            return queryset.filter(**{f"{relation}__user_id": user_id})
+
+        related = model.objects.filter(user_id=user_id, content_type=content_type)
+        added = [pk for pk, values in changes.items() if values is not None]
+        removed = [pk for pk, values in changes.items() if values is None]
+        return queryset.filter(
+            Q(pk__in=related.values("object_id")) | Q(pk__in=added)
+        ).exclude(pk__in=removed)
+
+    def bulk_toggle(self, request: Request) -> Response:
+        serializer = BulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+        relations = self.get_relation_model().objects
+        flushed = self.flush_buffered_writes()
+
+        if request.method == "POST":
+            accessible = self.get_accessible_ids(ids)
+            existing = None
+            if not flushed:
+                existing = self.buffer_bulk_changes(dict.fromkeys(accessible, {}))
+            if existing is None:
+                rows = relations.filter(**self.get_bulk_filter(accessible))
+                with transaction.atomic():
+                    existing = set(rows.values_list("object_id", flat=True))
+                    relations.bulk_create(
+                        self.build_relations(accessible - existing),
+                        ignore_conflicts=True,
+                    )
+            outcomes = {
+                pk: (
+                    BulkOutcomeSerializer.Status.EXISTS
+                    if pk in existing
+                    else BulkOutcomeSerializer.Status.CREATED
+                )
+                for pk in accessible
+            }
+        else:
+            existing = None
+            if not flushed:
+                existing = self.buffer_bulk_changes(dict.fromkeys(ids))
+            if existing is None:
+                with transaction.atomic():
+                    rows = relations.filter(**self.get_bulk_filter(ids))
+                    existing = set(rows.values_list("object_id", flat=True))
+                    rows.delete()
+            outcomes = {
+                pk: (
+                    BulkOutcomeSerializer.Status.DELETED
+                    if pk in existing
+                    else BulkOutcomeSerializer.Status.ABSENT
+                )
+                for pk in ids
+            }
+        return self.bulk_response(ids, outcomes)
 
 
 class PinMixin(RelationMixin, InteractionsPermsMixin):
     def get_relation_model(self) -> Type[Model]:
-        if self.action == "pins":
+        if self.action in {"pins", "bulk_pins"}:
             return Pin
         return super().get_relation_model()
 
@@ -53,6 +135,11 @@ class PinMixin(RelationMixin, InteractionsPermsMixin):
     ) -> Response:
         return super().toggle(request, pk=pk)
 
+    @bulk_toggle_schema
+    @action(detail=False, methods=["post", "delete"], url_path="pins/bulk")
+    def bulk_pins(self, request: Request, **kwargs: dict) -> Response:
+        return super().bulk_toggle(request)
+
     @action(
         detail=False,
         methods=["get"],
@@ -62,7 +149,7 @@ class PinMixin(RelationMixin, InteractionsPermsMixin):
         self, request: Request, user_id: Optional[int] = None, **kwargs: dict
     ):
         queryset = self.filter_queryset(self.get_queryset())
-        pined_queryset = queryset.filter(pins__user_id=user_id)
+        pined_queryset = self.filter_related(queryset, Pin, "pins", int(user_id))
 
         serializer_class = self.get_pins_serializer_class()
 
@@ -79,7 +166,7 @@ class PinMixin(RelationMixin, InteractionsPermsMixin):
 
 class SaveMixin(RelationMixin, InteractionsPermsMixin):
     def get_relation_model(self) -> Type[Model]:
-        if self.action == "saves":
+        if self.action in {"saves", "bulk_saves"}:
             return Save
         return super().get_relation_model()
 
@@ -96,6 +183,11 @@ class SaveMixin(RelationMixin, InteractionsPermsMixin):
     ) -> Response:
         return super().toggle(request, pk=pk)
 
+    @bulk_toggle_schema
+    @action(detail=False, methods=["post", "delete"], url_path="saves/bulk")
+    def bulk_saves(self, request: Request, **kwargs: dict) -> Response:
+        return super().bulk_toggle(request)
+
     @action(
         detail=False,
         methods=["get"],
@@ -105,7 +197,7 @@ class SaveMixin(RelationMixin, InteractionsPermsMixin):
         self, request: Request, user_id: Optional[int] = None, **kwargs: dict
     ):
         queryset = self.filter_queryset(self.get_queryset())
-        saved_queryset = queryset.filter(saves__user_id=user_id)
+        saved_queryset = self.filter_related(queryset, Save, "saves", int(user_id))
 
         serializer_class = self.get_saves_serializer_class()
 
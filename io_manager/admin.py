@@ -1 +1,23 @@
+from django.contrib import admin
 
+from io_manager.models import IOJob
+
+
+@admin.register(IOJob)
+class IOJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "user",
+        "kind",
+        "status",
+        "file_format",
+        "processed_rows",
+        "created",
+        "finished",
+    )
+    list_filter = ("kind", "status", "file_format")
+    search_fields = ("user__username", "strategy")
+    ordering = ("-created",)
+    raw_id_fields = ("user",)
+    readonly_fields = ("created", "finished")
+    list_select_related = ("user",)
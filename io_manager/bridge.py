@@ -1,28 +1,168 @@
 from __future__ import annotations
 
+import json
+import zipfile
 from typing import TYPE_CHECKING
 
+from django.core.cache import cache
+from django.utils import timezone
+
+from io_manager.cache import (
+    CACHE_EXPORT_KEY,
+    CACHE_EXPORT_MAX_SIZE,
+    CACHE_EXPORT_TTL,
+)
+from io_manager.utils import StreamBuffer
+
 if TYPE_CHECKING:
-    from typing import Any, BinaryIO
+    from typing import Any, BinaryIO, Callable, Iterable, Iterator
     from io_manager.formats import BaseFormat
     from io_manager.io import ImportStrategy, ExportStrategy
 
 
 class ModelIOBridge:
+    progress_every: int = 1000
+
     def __init__(
-        self, strategy: ImportStrategy | ExportStrategy, file_format: BaseFormat
+        self,
+        strategy: ImportStrategy | ExportStrategy,
+        file_format: BaseFormat,
+        on_progress: Callable[[int], None] | None = None,
     ) -> None:
         self.strategy = strategy
         self.file_format: BaseFormat = file_format
+        self.on_progress = on_progress
 
-    def import_file(self, file: BinaryIO) -> None:
+    def import_file(self, file: BinaryIO) -> dict[str, Any]:
         if not hasattr(self.strategy, "import_data"):
             raise TypeError("This strategy does not support import")
-        data: list[dict[str, Any]] = self.file_format.read(file)
-        self.strategy.import_data(data)
+        rows: Iterator[dict[str, Any]] = self.file_format.read(
+            file, **self.file_format.read_options
+        )
+        if self.strategy.options.get("dry_run"):
+            if not hasattr(self.strategy, "validate_data"):
+                raise TypeError("This strategy does not support dry runs")
+            return self.strategy.validate_data(self.track(rows))
+        return self.strategy.import_data(self.track(rows))
 
-    def export_file(self) -> bytes:
+    @property
+    def is_archive(self) -> bool:
+        return hasattr(self.strategy, "export_entries")
+
+    @property
+    def extension(self) -> str:
+        return "zip" if self.is_archive else self.file_format.name
+
+    @property
+    def mime(self) -> str:
+        return "application/zip" if self.is_archive else self.file_format.mime
+
+    def export_stream(self) -> Iterator[bytes]:
+        if self.is_archive:
+            return self.export_archive_stream()
         if not hasattr(self.strategy, "export_data"):
             raise TypeError("This strategy does not support export")
-        data: list[dict[str, Any]] = self.strategy.export_data()
-        return self.file_format.write(data)
+        rows: Iterator[dict[str, Any]] = self.strategy.export_data()
+        return self.file_format.write_stream(self.track(rows))
+
+    def export_archive_stream(self) -> Iterator[bytes]:
+        if not self.is_archive:
+            raise TypeError("This strategy does not support archive export")
+        return (chunk for chunk in self._write_archive() if chunk)
+
+    def _write_archive(self) -> Iterator[bytes]:
+        buffer = StreamBuffer()
+        manifest: list[dict[str, Any]] = []
+        processed = 0
+
+        def count(rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+            nonlocal processed
+            for row in rows:
+                processed += 1
+                if self.on_progress and processed % self.progress_every == 0:
+                    self.on_progress(processed)
+                yield row
+
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, rows, meta in self.strategy.export_entries():
+                filename = f"{name}.{self.file_format.name}"
+                started = processed
+                with archive.open(filename, "w") as entry:
+                    for chunk in self.file_format.write_stream(count(rows)):
+                        entry.write(chunk)
+                        yield buffer.drain()
+                manifest.append({**meta, "file": filename, "rows": processed - started})
+                yield buffer.drain()
+
+            archive.writestr(
+                "manifest.json",
+                json.dumps(
+                    {
+                        "created": timezone.now().isoformat(),
+                        "format": self.file_format.name,
+                        "entries": manifest,
+                    },
+                    ensure_ascii=False,
+                    indent=2,
+                ),
+            )
+        yield buffer.drain()
+
+        if self.on_progress:
+            self.on_progress(processed)
+
+    def export_file(self) -> bytes:
+        return b"".join(self.export_stream())
+
+    def export_cache_key(self) -> str | None:
+        version = self.strategy.get_version()
+        if version is None:
+            return None
+        return CACHE_EXPORT_KEY.format(
+            version=version, file_format=self.file_format.name
+        )
+
+    def export_cached(self) -> Iterator[bytes]:
+        key = self.export_cache_key()
+        if key is None:
+            return self.export_stream()
+
+        content = cache.get(key)
+        if content is not None:
+            return iter([content])
+        return self._cache_chunks(key, self.export_stream())
+
+    def prerender(self) -> bool:
+        key = self.export_cache_key()
+        if key is None or cache.has_key(key):
+            return False
+        for _ in self._cache_chunks(key, self.export_stream()):
+            pass
+        return cache.has_key(key)
+
+    def _cache_chunks(self, key: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        buffered: list[bytes] | None = []
+        size = 0
+        for chunk in chunks:
+            if buffered is not None:
+                size += len(chunk)
+                if size <= CACHE_EXPORT_MAX_SIZE:
+                    buffered.append(chunk)
+                else:
+                    buffered = None
+            yield chunk
+        if buffered is not None:
+            cache.set(key, b"".join(buffered), CACHE_EXPORT_TTL)
+
+    def track(self, rows: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+        if self.on_progress is None:
+            return rows
+        return self._count_rows(rows)
+
+    def _count_rows(self, rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            yield row
+            if count % self.progress_every == 0:
+                self.on_progress(count)
+        self.on_progress(count)
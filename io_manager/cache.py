@@ -0,0 +1,6 @@
+CACHE_JOB_PROGRESS_KEY = "io:jobs:{job_id}:progress"
+CACHE_JOB_PROGRESS_TTL = 60 * 60 * 24
+
+CACHE_EXPORT_KEY = "io:exports:{version}:{file_format}"
+CACHE_EXPORT_TTL = 60 * 60 * 24
+CACHE_EXPORT_MAX_SIZE = 5 * 1024 * 1024
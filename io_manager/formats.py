@@ -1,36 +1,59 @@
 from __future__ import annotations
 
+import codecs
 import csv
 import io
+import tempfile
 from abc import ABC, abstractmethod
 from typing import BinaryIO, TYPE_CHECKING
 
-import pandas as pd
+import openpyxl
+from charset_normalizer import from_bytes
 
 if TYPE_CHECKING:
-    from typing import Type, Any
+    from typing import Type, Any, Iterable, Iterator
+
+
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
 
 
 class BaseFormat(ABC):
     name: str | None = None
     mime: str | None = None
+    magic: bytes | None = None
+
+    def __init__(self, **read_options: Any) -> None:
+        self.read_options = read_options
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         super().__init_subclass__(**kwargs)
         if cls.name:
             FormatRegistry.register(cls.name, cls)
 
+    @classmethod
+    def sniff(cls, sample: bytes) -> dict[str, Any] | None:
+        if cls.magic and sample.startswith(cls.magic):
+            return {}
+        return None
+
     @staticmethod
     @abstractmethod
-    def read(file: BinaryIO, **kwargs: Any) -> list[dict[str, Any]]: ...
+    def read(file: BinaryIO, **kwargs: Any) -> Iterator[dict[str, Any]]: ...
 
     @staticmethod
     @abstractmethod
     def write(data: list[dict[str, Any]], **kwargs: Any) -> bytes: ...
 
+    @classmethod
+    def write_stream(
+        cls, rows: Iterable[dict[str, Any]], **kwargs: Any
+    ) -> Iterator[bytes]:
+        yield cls.write(list(rows), **kwargs)
+
 
 class FormatRegistry:
     _formats: dict[str, Type[BaseFormat]] = {}
+    sniff_size: int = 64 * 1024
 
     @classmethod
     def register(cls, name: str, format_cls: Type[BaseFormat]) -> None:
@@ -42,51 +65,140 @@ class FormatRegistry:
             raise ValueError(f"Format {name} not registered")
         return cls._formats[name]()
 
+    @classmethod
+    def sniff(cls, file: BinaryIO) -> BaseFormat:
+        sample = file.read(cls.sniff_size)
+        file.seek(0)
+
+        if sample.startswith(OLE_MAGIC):
+            raise ValueError("Legacy .xls files are not supported, save as .xlsx")
+
+        # Binary containers are recognised by their magic bytes before any
+        # text format gets to guess at the content
+        candidates = sorted(cls._formats.values(), key=lambda f: f.magic is None)
+        for format_cls in candidates:
+            read_options = format_cls.sniff(sample)
+            if read_options is not None:
+                return format_cls(**read_options)
+        raise ValueError("Unrecognised file content")
+
 
 class CSVFormat(BaseFormat):
     name = "csv"
     mime = "text/csv"
+    delimiters: str = ",;\t|"
+    sniff_lines: int = 50
 
     @staticmethod
-    def read(file: BinaryIO, encoding: str = "utf-8") -> list[dict[str, Any]]:
+    def read(
+        file: BinaryIO, encoding: str = "utf-8", delimiter: str = ","
+    ) -> Iterator[dict[str, Any]]:
         try:
-            raw = file.read()
-            if isinstance(raw, bytes):
-                decoded = raw.decode(encoding)
-            else:
-                decoded = str(raw)
-            reader = csv.DictReader(io.StringIO(decoded))
-            return [row for row in reader]
+            reader = csv.DictReader(
+                codecs.getreader(encoding)(file), delimiter=delimiter
+            )
+            yield from reader
         except Exception as e:
             raise ValueError(f"CSV read error: {e}")
 
+    @classmethod
+    def sniff(cls, sample: bytes) -> dict[str, Any] | None:
+        encoding = cls.detect_encoding(sample)
+        if encoding is None:
+            return None
+
+        text = sample.decode(encoding, errors="ignore")
+        lines = text.splitlines()
+        if len(lines) > 1 and not text.endswith(("\r", "\n")):
+            # The last line is cut off by the sample boundary
+            lines.pop()
+        text = "\n".join(lines[: cls.sniff_lines])
+        try:
+            delimiter = csv.Sniffer().sniff(text, delimiters=cls.delimiters).delimiter
+        except csv.Error:
+            delimiter = ","
+        return {"encoding": encoding, "delimiter": delimiter}
+
+    @staticmethod
+    def detect_encoding(sample: bytes) -> str | None:
+        if sample.startswith(codecs.BOM_UTF8):
+            return "utf-8-sig"
+        match = from_bytes(sample).best()
+        if match is None:
+            return None
+        return "utf-8" if match.encoding == "ascii" else match.encoding
+
+    flush_rows: int = 1000
+
     @staticmethod
     def write(data: list[dict[str, Any]], encoding: str = "utf-8") -> bytes:
+        return b"".join(CSVFormat.write_stream(data, encoding=encoding))
+
+    @classmethod
+    def write_stream(
+        cls, rows: Iterable[dict[str, Any]], encoding: str = "utf-8"
+    ) -> Iterator[bytes]:
         output = io.StringIO()
-        if data:
-            fieldnames = list(data[0].keys())
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
-        return output.getvalue().encode(encoding)
+        writer: csv.DictWriter | None = None
+        for count, row in enumerate(rows, start=1):
+            if writer is None:
+                writer = csv.DictWriter(output, fieldnames=list(row.keys()))
+                writer.writeheader()
+            writer.writerow(row)
+            if count % cls.flush_rows == 0:
+                yield output.getvalue().encode(encoding)
+                output.seek(0)
+                output.truncate()
+        if output.tell():
+            yield output.getvalue().encode(encoding)
 
 
 class XLSXFormat(BaseFormat):
     name = "xlsx"
     mime = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    magic = b"PK\x03\x04"
+    chunk_size: int = 64 * 1024
 
     @staticmethod
-    def read(file: BinaryIO, sheet_name: int = 0) -> list[dict[str, Any]]:
+    def read(file: BinaryIO, sheet_name: int = 0) -> Iterator[dict[str, Any]]:
+        try:
+            workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        except Exception as e:
+            raise ValueError(f"XLSX read error: {e}")
         try:
-            df = pd.read_excel(file, sheet_name=sheet_name)
-            return df.to_dict(orient="records")
+            rows = workbook.worksheets[sheet_name].iter_rows(values_only=True)
+            header = next(rows, ())
+            for values in rows:
+                if any(value is not None for value in values):
+                    # read_only sheets drop trailing empty cells
+                    padding = (None,) * (len(header) - len(values))
+                    yield dict(zip(header, values + padding))
         except Exception as e:
             raise ValueError(f"XLSX read error: {e}")
+        finally:
+            workbook.close()
 
     @staticmethod
     def write(data: list[dict[str, Any]], sheet_name: str = "Sheet1") -> bytes:
-        df = pd.DataFrame(data)
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name=sheet_name)
-        return output.getvalue()
+        return b"".join(XLSXFormat.write_stream(data, sheet_name=sheet_name))
+
+    @classmethod
+    def write_stream(
+        cls, rows: Iterable[dict[str, Any]], sheet_name: str = "Sheet1"
+    ) -> Iterator[bytes]:
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet(sheet_name)
+        header: list[str] | None = None
+        for row in rows:
+            if header is None:
+                header = list(row.keys())
+                sheet.append(header)
+            sheet.append([row.get(key) for key in header])
+
+        # The zip container is only complete once the workbook is saved, so
+        # rows are spooled to disk by openpyxl and the file is streamed after.
+        with tempfile.TemporaryFile() as output:
+            workbook.save(output)
+            output.seek(0)
+            while chunk := output.read(cls.chunk_size):
+                yield chunk
@@ -3,24 +3,83 @@ from __future__ import annotations
 from abc import abstractmethod, ABC
 from typing import TYPE_CHECKING
 
+from django.db import models
+
 if TYPE_CHECKING:
-    from typing import Any
+    from typing import Any, Callable, Iterable, Iterator, Type
     from rest_framework.permissions import BasePermission
+    from rest_framework.serializers import Serializer
     from django.db.models import Model
 
 
+class ImportMode(models.TextChoices):
+    SKIP = "skip", "Skip duplicates"
+    UPDATE = "update", "Update duplicates"
+    FAIL = "fail", "Fail on duplicates"
+    SYNC = "sync", "Sync with file"
+
+
 class BaseStrategy(ABC):
-    def __init__(self, model: Model) -> None:
+    def __init__(self, model: Model, **options: Any) -> None:
         self.model = model
+        self.options = options
 
     perms: list[BasePermission] = []
+    options_serializer_class: Type[Serializer] | None = None
+
+    @classmethod
+    def get_perms(cls, options: dict[str, Any]) -> list[BasePermission]:
+        return cls.perms
 
 
 class ImportStrategy(BaseStrategy, ABC):
+    batch_size: int = 1000
+    max_errors: int = 100
+    report_errors: int = 1000
+    preview_rows: int = 20
+
     @abstractmethod
-    def import_data(self, data: list[dict[str, Any]]) -> None: ...
+    def import_data(self, rows: Iterable[dict[str, Any]]) -> dict[str, int]: ...
 
 
 class ExportStrategy(BaseStrategy, ABC):
+    chunk_size: int = 2000
+
+    @abstractmethod
+    def export_data(self) -> Iterator[dict[str, Any]]: ...
+
+    def get_version(self) -> str | None:
+        return None
+
+    def record_download(self) -> None: ...
+
+
+class ArchiveExportStrategy(BaseStrategy, ABC):
+    chunk_size: int = 2000
+    background_rows: int = 50_000
+
+    @abstractmethod
+    def export_entries(
+        self,
+    ) -> Iterator[tuple[str, Iterable[dict[str, Any]], dict[str, Any]]]: ...
+
+    def count_rows(self) -> int:
+        return 0
+
+    def should_run_in_background(self) -> bool:
+        return self.count_rows() > self.background_rows
+
+
+class TaskStrategy(BaseStrategy, ABC):
+    background_rows: int = 50_000
+
     @abstractmethod
-    def export_data(self) -> list[dict[str, Any]]: ...
+    def run_task(
+        self, on_progress: Callable[[int], None] | None = None
+    ) -> dict[str, Any]: ...
+
+    def count_rows(self) -> int:
+        return 0
+
+    def should_run_in_background(self) -> bool:
+        return self.count_rows() > self.background_rows
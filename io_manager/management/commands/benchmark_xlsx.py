@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import io
+import multiprocessing
+import resource
+import time
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+
+if TYPE_CHECKING:
+    from typing import Any, BinaryIO, Iterator
+
+
+def legacy_read(file: BinaryIO) -> list[dict[str, Any]]:
+    import pandas as pd
+
+    return pd.read_excel(file, sheet_name=0).to_dict(orient="records")
+
+
+def legacy_write(data: list[dict[str, Any]]) -> bytes:
+    import pandas as pd
+
+    df = pd.DataFrame(data)
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        df.to_excel(writer, index=False, sheet_name="Sheet1")
+    return output.getvalue()
+
+
+def generate_rows(count: int) -> Iterator[dict[str, str]]:
+    for i in range(count):
+        yield {"original": f"original {i}", "translation": f"translation {i}"}
+
+
+def run_case(engine: str, operation: str, rows: int, path: str) -> tuple[float, int]:
+    from io_manager.formats import XLSXFormat
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    if operation == "write":
+        if engine == "legacy":
+            content = legacy_write(list(generate_rows(rows)))
+            with open(path, "wb") as file:
+                file.write(content)
+        else:
+            with open(path, "wb") as file:
+                for chunk in XLSXFormat.write_stream(generate_rows(rows)):
+                    file.write(chunk)
+    else:
+        with open(path, "rb") as file:
+            if engine == "legacy":
+                read = len(legacy_read(file))
+            else:
+                read = sum(1 for _ in XLSXFormat.read(file))
+        assert read == rows, f"expected {rows} rows, read {read}"
+    elapsed = time.perf_counter() - started
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the streaming openpyxl XLSX engine with the previous pandas "
+        "engine. Every case runs in a fresh process and reports how far peak RSS "
+        "grew above the process baseline, pandas import included."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--rows", nargs="+", type=int, default=[10_000, 100_000, 1_000_000]
+        )
+        parser.add_argument(
+            "--engines",
+            nargs="+",
+            choices=["legacy", "streaming"],
+            default=["legacy", "streaming"],
+        )
+        parser.add_argument("--path", default="/tmp/benchmark_xlsx.xlsx")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        context = multiprocessing.get_context("spawn")
+        self.stdout.write(
+            f"{'rows':>9} {'engine':>10} {'op':>6} {'seconds':>9} {'+peak RSS MB':>13}"
+        )
+        for rows in options["rows"]:
+            for engine in options["engines"]:
+                for operation in ("write", "read"):
+                    with context.Pool(1) as pool:
+                        elapsed, peak_kb = pool.apply(
+                            run_case, (engine, operation, rows, options["path"])
+                        )
+                    self.stdout.write(
+                        f"{rows:>9} {engine:>10} {operation:>6} "
+                        f"{elapsed:>9.2f} {peak_kb / 1024:>13.1f}"
+                    )
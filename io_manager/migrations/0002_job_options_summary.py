@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("io_manager", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="iojob",
+            name="options",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="iojob",
+            name="summary",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
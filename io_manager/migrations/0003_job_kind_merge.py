@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("io_manager", "0002_job_options_summary"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="iojob",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("import", "Import"),
+                    ("export", "Export"),
+                    ("merge", "Merge"),
+                ],
+                max_length=6,
+            ),
+        ),
+    ]
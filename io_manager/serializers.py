@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+from io_manager.cache import CACHE_JOB_PROGRESS_KEY
+from io_manager.io import ImportMode
+from io_manager.models import IOJob
+
+
+class IOJobSerializer(serializers.ModelSerializer):
+    processed_rows = serializers.SerializerMethodField()
+    download = serializers.SerializerMethodField()
+
+    class Meta:
+        model = IOJob
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "file_format",
+            "processed_rows",
+            "errors",
+            "summary",
+            "download",
+            "created",
+            "finished",
+        ]
+
+    def get_processed_rows(self, obj: IOJob) -> int:
+        if obj.status == IOJob.Status.RUNNING:
+            key = CACHE_JOB_PROGRESS_KEY.format(job_id=obj.id)
+            return cache.get(key, obj.processed_rows)
+        return obj.processed_rows
+
+    def get_download(self, obj: IOJob) -> str | None:
+        if not obj.result:
+            return None
+        return reverse(
+            "iojob-download", args=[obj.pk], request=self.context.get("request")
+        )
+
+
+class ImportOptionsSerializer(serializers.Serializer):
+    mode = serializers.ChoiceField(choices=ImportMode.choices, default=ImportMode.FAIL)
+    dry_run = serializers.BooleanField(default=False)
@@ -0,0 +1,68 @@
+import tempfile
+
+from celery import shared_task
+from django.core.cache import cache
+from django.core.files import File
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from io_manager.bridge import ModelIOBridge
+from io_manager.cache import CACHE_JOB_PROGRESS_KEY, CACHE_JOB_PROGRESS_TTL
+from io_manager.exceptions import ImportRowsError
+from io_manager.formats import FormatRegistry
+from io_manager.models import IOJob
+
+
+@shared_task
+def run_io_job(job_id: int) -> None:
+    try:
+        job = IOJob.objects.get(id=job_id, status=IOJob.Status.PENDING)
+    except IOJob.DoesNotExist:
+        return
+
+    job.status = IOJob.Status.RUNNING
+    job.save(update_fields=["status"])
+
+    progress_key = CACHE_JOB_PROGRESS_KEY.format(job_id=job.id)
+
+    def report_progress(count: int) -> None:
+        job.processed_rows = count
+        cache.set(progress_key, count, CACHE_JOB_PROGRESS_TTL)
+
+    try:
+        strategy = import_string(job.strategy)(job.target, **job.options)
+
+        if job.kind == IOJob.Kind.IMPORT:
+            with job.file.open("rb") as file:
+                file_format = FormatRegistry.sniff(file)
+                bridge = ModelIOBridge(
+                    strategy, file_format, on_progress=report_progress
+                )
+                job.summary = bridge.import_file(file)
+        elif job.kind == IOJob.Kind.MERGE:
+            job.summary = strategy.run_task(on_progress=report_progress)
+        else:
+            file_format = FormatRegistry.get(job.file_format)
+            bridge = ModelIOBridge(strategy, file_format, on_progress=report_progress)
+            with tempfile.TemporaryFile() as output:
+                for chunk in bridge.export_stream():
+                    output.write(chunk)
+                output.seek(0)
+                job.result.save(
+                    f"export_{job.id}.{bridge.extension}", File(output), save=False
+                )
+    except ImportRowsError as e:
+        job.status = IOJob.Status.FAILED
+        job.errors = e.errors
+    except Exception as e:
+        job.status = IOJob.Status.FAILED
+        job.errors = [{"detail": str(e)}]
+    else:
+        job.status = IOJob.Status.DONE
+
+    if job.file:
+        job.file.delete(save=False)
+
+    job.finished = timezone.now()
+    job.save()
+    cache.delete(progress_key)
@@ -0,0 +1,8 @@
+from rest_framework.routers import DefaultRouter
+
+from .views import IOJobViewSet
+
+router = DefaultRouter()
+router.register(r"jobs", IOJobViewSet, basename="iojob")
+
+urlpatterns = router.urls
@@ -1,50 +1,142 @@
 from __future__ import annotations
 
-import io
+from itertools import chain
 from typing import TYPE_CHECKING
 
-from django.http import FileResponse
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.http import (
+    FileResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter,
     OpenApiExample,
     OpenApiResponse,
 )
-from rest_framework import status
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotAuthenticated, NotFound
 from rest_framework.generics import get_object_or_404
 from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from io_manager.bridge import ModelIOBridge
+from io_manager.exceptions import ImportRowsError
 from io_manager.formats import FormatRegistry
+from io_manager.io import ImportMode
+from io_manager.models import IOJob
+from io_manager.pagination import IOJobPagination
+from io_manager.serializers import IOJobSerializer
+from io_manager.tasks import run_io_job
 
 if TYPE_CHECKING:
-    from io_manager.io import ImportStrategy, ExportStrategy
-    from django.db.models import Model
-    from typing import Type
+    from io_manager.io import (
+        ArchiveExportStrategy,
+        BaseStrategy,
+        ExportStrategy,
+        ImportStrategy,
+    )
+    from django.core.files.uploadedfile import UploadedFile
+    from django.db.models import Model, QuerySet
+    from typing import Any, Type
     from rest_framework.permissions import BasePermission
     from rest_framework.request import Request
 
 
+ASYNC_PARAMETER = OpenApiParameter(
+    name="async",
+    description="Queue the operation as a background job and return it (202).",
+    required=False,
+    type=bool,
+)
+
+
+class BackgroundJobMixin:
+    def get_options(
+        self,
+        request: Request,
+        strategy: Type[BaseStrategy],
+        data: dict[str, Any],
+    ) -> dict[str, Any]:
+        if not strategy.options_serializer_class:
+            return {}
+        serializer = strategy.options_serializer_class(
+            data=data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        return dict(serializer.validated_data)
+
+    def wants_background(self, request: Request) -> bool:
+        return request.query_params.get("async", "").lower() in {"1", "true", "yes"}
+
+    def enqueue_job(
+        self,
+        request: Request,
+        kind: IOJob.Kind,
+        strategy: Type[BaseStrategy],
+        file_format: str,
+        instance: Model | None,
+        file: UploadedFile | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> Response:
+        if not request.user.is_authenticated:
+            raise NotAuthenticated("Background jobs require authentication.")
+
+        job = IOJob.objects.create(
+            user=request.user,
+            kind=kind,
+            strategy=f"{strategy.__module__}.{strategy.__qualname__}",
+            file_format=file_format,
+            content_type=(
+                ContentType.objects.get_for_model(instance) if instance else None
+            ),
+            object_id=instance.pk if instance else None,
+            file=file,
+            options=options or {},
+        )
+        transaction.on_commit(lambda: run_io_job.delay(job.id))
+
+        serializer = IOJobSerializer(job, context={"request": request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
 @extend_schema(
+    parameters=[ASYNC_PARAMETER],
     request={
         "multipart/form-data": {
             "type": "object",
             "properties": {
                 "file": {"type": "string", "format": "binary"},
+                "mode": {
+                    "type": "string",
+                    "enum": ImportMode.values,
+                    "default": ImportMode.FAIL,
+                },
+                "dry_run": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Validate the file and return a report "
+                    "without importing anything.",
+                },
             },
             "required": ["file"],
         }
     },
     responses={
-        200: OpenApiResponse(description="Import successful"),
+        200: OpenApiResponse(description="Import successful or dry run report"),
+        202: OpenApiResponse(IOJobSerializer, description="Import job queued"),
         400: OpenApiResponse(description="Invalid format or import error"),
         404: OpenApiResponse(description="Object not found"),
         500: OpenApiResponse(description="Strategy or model not defined"),
     },
 )
-class GenericImportView(APIView):
+class GenericImportView(BackgroundJobMixin, APIView):
     parser_classes = [MultiPartParser]
     strategy: Type[ImportStrategy] | None = None
     model: Type[Model] | None = None
@@ -59,27 +151,49 @@ class GenericImportView(APIView):
 
         instance = get_object_or_404(self.model, pk=pk) if pk else None
 
+        # Some import modes change existing rows and ask for more than others
+        options = self.import_options = self.get_options(
+            request, self.strategy, request.data
+        )
         self.check_object_permissions(request, instance)
 
-        ext = file.name.split(".")[-1].lower()
-        file_format = FormatRegistry.get(ext)
-        if not file_format:
-            return Response({"detail": f"Unsupported file format: {ext}"}, status=400)
+        try:
+            file_format = FormatRegistry.sniff(file)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
+
+        if self.wants_background(request):
+            return self.enqueue_job(
+                request,
+                IOJob.Kind.IMPORT,
+                self.strategy,
+                file_format.name,
+                instance,
+                file=file,
+                options=options,
+            )
 
         try:
-            strategy = self.strategy(instance)
+            strategy = self.strategy(instance, **options)
             bridge = ModelIOBridge(strategy, file_format)
-            bridge.import_file(file)
+            result = bridge.import_file(file)
+        except ImportRowsError as e:
+            return Response({"detail": "Import failed", "errors": e.errors}, status=400)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=400)
         except Exception:
             return Response(
                 {"detail": "An unexpected error occurred. Please contact support."},
                 status=500,
             )
 
-        return Response({"detail": "Import successful"}, status=200)
+        if options.get("dry_run"):
+            return Response({"detail": "Dry run finished", **result}, status=200)
+
+        return Response({"detail": "Import successful", "summary": result}, status=200)
 
     def get_permissions(self) -> list[BasePermission]:
-        return self.strategy.perms
+        return self.strategy.get_perms(getattr(self, "import_options", {}))
 
 
 @extend_schema(
@@ -94,6 +208,7 @@ class GenericImportView(APIView):
                 OpenApiExample("Excel format", value="xlsx"),
             ],
         ),
+        ASYNC_PARAMETER,
     ],
     responses={
         200: OpenApiResponse(
@@ -104,16 +219,20 @@ class GenericImportView(APIView):
                 ),
             ],
         ),
+        202: OpenApiResponse(IOJobSerializer, description="Export job queued"),
+        304: OpenApiResponse(description="Export unchanged since If-None-Match"),
         400: OpenApiResponse(description="Invalid format or export error"),
         404: OpenApiResponse(description="Object not found"),
         500: OpenApiResponse(description="Strategy not defined"),
     },
 )
-class GenericExportView(APIView):
+class GenericExportView(BackgroundJobMixin, APIView):
     strategy: Type[ExportStrategy] | None = None
     model: Type[Model] | None = None
 
-    def get(self, request: Request, pk: int | None = None) -> Response | FileResponse:
+    def get(
+        self, request: Request, pk: int | None = None
+    ) -> Response | HttpResponseNotModified | StreamingHttpResponse:
         if not self.strategy:
             return Response(
                 {"detail": "Strategy not defined."},
@@ -122,8 +241,9 @@ class GenericExportView(APIView):
 
         fmt = request.query_params.get("file_format", "csv")
 
-        file_format = FormatRegistry.get(fmt.lower())
-        if not file_format:
+        try:
+            file_format = FormatRegistry.get(fmt.lower())
+        except ValueError:
             return Response(
                 {"detail": f"Unsupported format '{fmt}'"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -133,10 +253,36 @@ class GenericExportView(APIView):
 
         self.check_object_permissions(request, instance)
 
+        options = self.get_options(request, self.strategy, request.query_params)
+
+        if self.wants_background(request):
+            return self.enqueue_job(
+                request,
+                IOJob.Kind.EXPORT,
+                self.strategy,
+                fmt.lower(),
+                instance,
+                options=options,
+            )
+
+        strategy = self.strategy(instance, **options)
+
+        version = strategy.get_version()
+        etag = quote_etag(f"{version}-{file_format.name}") if version else None
+
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag and (etag in if_none_match or "*" in if_none_match):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        # Revalidations are not downloads
+        strategy.record_download()
+
         try:
-            strategy = self.strategy(instance)
             bridge = ModelIOBridge(strategy, file_format)
-            file_content = bridge.export_file()
+            stream = bridge.export_cached()
+            first_chunk = next(stream, b"")
         except Exception:
             return Response(
                 {"detail": "An unexpected error occurred. Please contact support."},
@@ -145,12 +291,115 @@ class GenericExportView(APIView):
 
         filename = f"{self.model.__name__.lower()}_export.{fmt}"
 
-        return FileResponse(
-            io.BytesIO(file_content),
-            as_attachment=True,
-            filename=filename,
-            content_type=file_format.mime,
+        response = StreamingHttpResponse(
+            chain([first_chunk], stream), content_type=file_format.mime
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        if etag:
+            response["ETag"] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_permissions(self) -> list[BasePermission]:
+        return self.strategy.perms
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="file_format",
+            description="Format of each file inside the archive (`csv` or `xlsx`).",
+            required=False,
+            type=str,
+        ),
+        ASYNC_PARAMETER,
+    ],
+    responses={
+        200: OpenApiResponse(description="ZIP archive with a manifest.json"),
+        202: OpenApiResponse(IOJobSerializer, description="Export job queued"),
+        400: OpenApiResponse(description="Invalid format or selection"),
+        500: OpenApiResponse(description="Strategy not defined"),
+    },
+)
+class GenericArchiveExportView(BackgroundJobMixin, APIView):
+    strategy: Type[ArchiveExportStrategy] | None = None
+    filename: str = "archive"
+
+    def get(self, request: Request) -> Response | StreamingHttpResponse:
+        if not self.strategy:
+            return Response(
+                {"detail": "Strategy not defined."},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        fmt = request.query_params.get("file_format", "csv").lower()
+        try:
+            file_format = FormatRegistry.get(fmt)
+        except ValueError:
+            return Response(
+                {"detail": f"Unsupported format '{fmt}'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        options = self.get_options(request, self.strategy, request.query_params)
+        strategy = self.strategy(request.user, **options)
+
+        if self.wants_background(request) or strategy.should_run_in_background():
+            return self.enqueue_job(
+                request,
+                IOJob.Kind.EXPORT,
+                self.strategy,
+                fmt,
+                request.user,
+                options=options,
+            )
+
+        try:
+            bridge = ModelIOBridge(strategy, file_format)
+            stream = bridge.export_stream()
+            first_chunk = next(stream, b"")
+        except Exception:
+            return Response(
+                {"detail": "An unexpected error occurred. Please contact support."},
+                status=500,
+            )
+
+        response = StreamingHttpResponse(
+            chain([first_chunk], stream), content_type=bridge.mime
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.filename}.{bridge.extension}"'
         )
+        return response
 
     def get_permissions(self) -> list[BasePermission]:
         return self.strategy.perms
+
+
+@extend_schema(tags=["io"])
+class IOJobViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    serializer_class = IOJobSerializer
+    pagination_class = IOJobPagination
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self) -> QuerySet[IOJob]:
+        if getattr(self, "swagger_fake_view", False):
+            return IOJob.objects.none()
+        return IOJob.objects.filter(user=self.request.user)
+
+    @extend_schema(responses={200: OpenApiResponse(description="Exported file")})
+    @action(detail=True, methods=["get"])
+    def download(self, request: Request, pk: int | None = None) -> FileResponse:
+        job = self.get_object()
+        if not job.result:
+            raise NotFound("This job has no file to download.")
+        extension = job.result.name.rsplit(".", 1)[-1]
+        return FileResponse(
+            job.result.open("rb"),
+            as_attachment=True,
+            filename=f"{job.kind}_{job.pk}.{extension}",
+        )
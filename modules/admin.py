@@ -40,7 +40,7 @@ class ModuleAdmin(admin.ModelAdmin):
     list_filter = ("visible",)
     list_editable = ("visible",)
     search_fields = ("name", "description")
-    readonly_fields = ("created", "folders_count", "cards_count")
+    readonly_fields = ("created", "card_source", "folders_count", "cards_count")
     raw_id_fields = (
         "user",
         "topic",
@@ -54,13 +54,8 @@ class ModuleAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         return qs.annotate(
             folders_count=Count("folders", distinct=True),
-            cards_count=Count("cards", distinct=True),
         )
 
     @admin.display(description="Folders Count", ordering="folders_count")
     def folders_count(self, obj):
         return obj.folders_count
-
-    @admin.display(description="Cards Count", ordering="cards_count")
-    def cards_count(self, obj):
-        return obj.cards_count
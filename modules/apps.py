@@ -6,6 +6,7 @@ class ModulesConfig(AppConfig):
     name = "modules"
 
     def ready(self):
+        import modules.signals  # noqa
         from modules import policies
         from modules.views import ModuleViewSet
 
@@ -0,0 +1,7 @@
+CACHE_POPULAR_EXPORTS_KEY = "modules:exports:popular"
+CACHE_POPULAR_EXPORTS_SIZE = 1000
+PRERENDER_EXPORTS_LIMIT = 50
+CACHE_PROGRESS_KEY = "modules:progress:{user_id}:{card_set_id}"
+CACHE_PROGRESS_TTL = 60 * 10
+PROGRESS_MAX_MODULES = 100
+CARD_SET_COPY_BATCH = 1000
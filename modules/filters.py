@@ -2,10 +2,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 import django_filters
-from django.db.models import Q, Count
+from django.contrib.postgres.search import SearchRank
+from django.db.models import Q, Count, F, FloatField
+from django.db.models.functions import Cast
 from django_filters import rest_framework as filters
 
+from languages.models import Language
 from modules.models import Module
+from modules.search import SEARCH_CONFIGS, search_query
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -33,10 +37,13 @@ class ModuleFilter(django_filters.FilterSet):
 
     tags = CharInFilter(method="filter_tags")
 
+    search = django_filters.CharFilter(method="filter_search")
+
     ordering = django_filters.OrderingFilter(
         fields=(
             ("name", "name"),
             ("created", "created"),
+            ("cards_count", "cards_count"),
         )
     )
 
@@ -67,3 +74,31 @@ class ModuleFilter(django_filters.FilterSet):
             .filter(matching_tags_count__gt=0)
             .order_by("-matching_tags_count")
         )
+
+    def filter_search(
+        self, queryset: QuerySet[Module], name: str, value: str
+    ) -> QuerySet[Module]:
+        if not value:
+            return queryset
+
+        language_ids = [
+            self.form.cleaned_data[field]
+            for field in ("lang_from", "lang_to")
+            if self.form.cleaned_data.get(field)
+        ]
+        if language_ids:
+            codes = Language.objects.filter(pk__in=language_ids).values_list(
+                "code", flat=True
+            )
+        else:
+            codes = SEARCH_CONFIGS
+
+        query = search_query(value, codes)
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(
+                # Double precision so that cursor positions round-trip exactly
+                search_rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+            )
+            .order_by("-search_rank", "pk")
+        )
@@ -1,17 +1,41 @@
 from __future__ import annotations
 
+from itertools import groupby
+from operator import itemgetter
 from typing import TYPE_CHECKING
 
-from django.core.exceptions import ValidationError
+import numpy as np
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Coalesce
+from django_redis import get_redis_connection
+from django.utils.functional import cached_property
+from django.utils.text import slugify
 from rest_framework import permissions
 
 from abstracts.permissions import IsObjPublic
 from common.permissions import IsObjAdmin, IsObjOwner, partial_cls
 from generic_status.permissions import HasObjRoles
-from io_manager.io import ExportStrategy, ImportStrategy
+from io_manager.exceptions import ImportRowsError
+from io_manager.io import (
+    ArchiveExportStrategy,
+    ExportStrategy,
+    ImportMode,
+    ImportStrategy,
+    TaskStrategy,
+)
+from io_manager.serializers import ImportOptionsSerializer
+from io_manager.utils import batched
+from cards.loader import CardBulkLoader
+from modules.cache import CACHE_POPULAR_EXPORTS_KEY
+from modules.models import Module
+from modules.serializers import ModuleArchiveOptionsSerializer
 
 if TYPE_CHECKING:
-    from typing import Any
+    from typing import Any, Callable, Iterable, Iterator
+    from cards.models import Card
+    from django.db.models import QuerySet
     from rest_framework.permissions import BasePermission
 
 
@@ -25,37 +49,533 @@ class ModuleCardsExporter(ExportStrategy):
         )()
     ]
 
-    def export_data(self) -> list[dict[str, str]]:
+    def export_data(self) -> Iterator[dict[str, str]]:
         from cards.models import Card
 
-        cards = Card.objects.filter(module=self.model)
-        return [
-            {"original": card.original, "translation": card.translation}
-            for card in cards
-        ]
+        return (
+            Card.objects.filter(module_id=self.model.card_set_id)
+            .values("original", "translation")
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+    def get_version(self) -> str:
+        # Copies that still share their cards share the cached export too
+        owner = self.model.card_source if self.model.card_source_id else self.model
+        return f"module-{owner.pk}-v{owner.cards_version}"
+
+    def record_download(self) -> None:
+        if self.model.visible != Module.Status.PUBLIC:
+            return
+        try:
+            redis = get_redis_connection("default")
+        except NotImplementedError:
+            return
+        redis.zincrby(CACHE_POPULAR_EXPORTS_KEY, 1, self.model.pk)
+
+
+class ModulesArchiveExporter(ArchiveExportStrategy):
+    perms: list[BasePermission] = [permissions.IsAuthenticated()]
+    options_serializer_class = ModuleArchiveOptionsSerializer
+
+    @property
+    def module_ids(self) -> list[int]:
+        return self.options.get("modules", [])
+
+    def get_modules(self) -> QuerySet[Module]:
+        return (
+            Module.objects.filter(id__in=self.module_ids)
+            .annotate(card_set=Coalesce("card_source_id", "id"))
+            .order_by("card_set", "id")
+        )
+
+    def count_rows(self) -> int:
+        from cards.models import Card
+
+        return Card.objects.filter(
+            module_id__in=self.get_modules().values("card_set")
+        ).count()
+
+    def export_entries(
+        self,
+    ) -> Iterator[tuple[str, Iterable[dict[str, str]], dict[str, Any]]]:
+        from cards.models import Card
+
+        modules = self.get_modules().values(
+            "id", "name", "card_set", "lang_from__code", "lang_to__code"
+        )
+        cards = (
+            Card.objects.filter(module_id__in=modules.values("card_set"))
+            .order_by("module_id", "id")
+            .values_list("module_id", "original", "translation")
+            .iterator(chunk_size=self.chunk_size)
+        )
+        groups = groupby(cards, key=itemgetter(0))
+        group = next(groups, None)
+
+        last_set = None
+        for module in modules:
+            rows: Iterable[dict[str, str]] = ()
+            if module["card_set"] == last_set:
+                # Another copy of a card set that has already been written
+                rows = (
+                    Card.objects.filter(module_id=last_set)
+                    .order_by("id")
+                    .values("original", "translation")
+                    .iterator(chunk_size=self.chunk_size)
+                )
+            elif group is not None and group[0] == module["card_set"]:
+                rows = (
+                    {"original": original, "translation": translation}
+                    for _, original, translation in group[1]
+                )
+                group = None
+            last_set = module["card_set"]
+
+            name = slugify(module["name"], allow_unicode=True) or "module"
+            yield (
+                f"{module['id']}_{name}",
+                rows,
+                {
+                    "id": module["id"],
+                    "name": module["name"],
+                    "lang_from": module["lang_from__code"],
+                    "lang_to": module["lang_to__code"],
+                },
+            )
+
+            if group is None:
+                group = next(groups, None)
 
 
 class ModuleCardsImporter(ImportStrategy):
     perms: list[BasePermission] = [permissions.IsAuthenticated()]
+    write_perms: list[BasePermission] = [
+        permissions.IsAuthenticated(),
+        (IsObjOwner | IsObjAdmin | partial_cls(HasObjRoles, roles=["editor"]))(),
+    ]
+    options_serializer_class = ImportOptionsSerializer
+
+    @classmethod
+    def get_perms(cls, options: dict[str, Any]) -> list[BasePermission]:
+        # Modes that touch existing cards need the same access as card writes,
+        # and so does a dry run, whose report tells which cards already exist
+        if options.get("dry_run") or options.get("mode") in {
+            ImportMode.UPDATE,
+            ImportMode.SYNC,
+        }:
+            return cls.write_perms
+        return cls.perms
+
+    def import_data(self, rows: Iterable[dict[str, Any]]) -> dict[str, int]:
+        from cards.models import Card
+
+        mode = self.options.get("mode", ImportMode.FAIL)
+        summary = {"inserted": 0, "updated": 0, "skipped": 0, "deleted": 0}
+        errors: list[dict[str, Any]] = []
+        seen: dict[tuple[str, str], int] = {}
+
+        with transaction.atomic():
+            self.model.prepare_cards_write()
+            cards = Card.objects.filter(module=self.model)
+            before = cards.count()
+
+            cleaned = self.clean_rows(rows, errors, seen, mode, summary)
+            if CardBulkLoader.is_supported():
+                written = self.copy_cards(cleaned, errors, mode)
+            else:
+                written = self.create_cards(cleaned, errors, seen, mode)
+
+            if mode == ImportMode.SYNC and not seen and not errors:
+                errors.append(
+                    {"row": 1, "detail": "A sync import needs at least one card."}
+                )
+            if errors:
+                raise ImportRowsError(errors[: self.max_errors])
+
+            summary["inserted"] = cards.count() - before
+            if mode == ImportMode.SYNC:
+                summary["deleted"] = self.delete_missing(seen)
+            if summary["inserted"] or summary["deleted"]:
+                Module.add_cards_count(
+                    self.model.pk, summary["inserted"] - summary["deleted"]
+                )
+
+        # A card is its whole unique key, an update has nothing left to write
+        existing = written - summary["inserted"]
+        if mode == ImportMode.UPDATE:
+            summary["updated"] = existing
+        else:
+            summary["skipped"] += existing
+        return summary
+
+    def copy_cards(
+        self,
+        rows: Iterable[tuple[int, str, str]],
+        errors: list[dict[str, Any]],
+        mode: ImportMode,
+    ) -> int:
+        with CardBulkLoader(self.model.pk) as loader:
+            written = loader.stage(rows)
+            if errors:
+                return written
+
+            if mode != ImportMode.FAIL:
+                loader.insert(ignore_conflicts=True)
+                return written
+
+            try:
+                with transaction.atomic():
+                    loader.insert()
+            except IntegrityError:
+                errors.extend(
+                    {"row": line, "detail": "Card already exists in this module."}
+                    for line in loader.conflicts(self.max_errors)
+                )
+        return written
+
+    def create_cards(
+        self,
+        rows: Iterable[tuple[int, str, str]],
+        errors: list[dict[str, Any]],
+        seen: dict[tuple[str, str], int],
+        mode: ImportMode,
+    ) -> int:
+        from cards.models import Card
+
+        written = 0
+        for batch in batched(rows, self.batch_size):
+            if errors:
+                continue
+            cards = [
+                Card(module=self.model, original=original, translation=translation)
+                for _, original, translation in batch
+            ]
+            if mode == ImportMode.FAIL:
+                try:
+                    with transaction.atomic():
+                        Card.objects.bulk_create(cards, batch_size=self.batch_size)
+                except IntegrityError:
+                    errors.extend(self.find_conflicts(cards, seen))
+            else:
+                Card.objects.bulk_create(
+                    cards, batch_size=self.batch_size, ignore_conflicts=True
+                )
+            written += len(cards)
+        return written
+
+    def delete_missing(self, seen: dict[tuple[str, str], int]) -> int:
+        from cards.models import Card
+
+        # Unchanged cards keep their ids, and with them every user's
+        # learn/save state; only pairs that left the file are removed
+        missing = [
+            pk
+            for pk, original, translation in Card.objects.filter(module=self.model)
+            .values_list("id", "original", "translation")
+            .iterator(chunk_size=self.batch_size)
+            if (original, translation) not in seen
+        ]
+        # The cards go with a raw delete instead of one signal per card. That
+        # is safe because everything the card receivers would do is done
+        # here or by the caller: the module stopped sharing its set in
+        # prepare_cards_write(), and cards_count and cards_version, which the
+        # export cache is keyed on, are adjusted once after the delete. The
+        # rows pointing at a card are all generic relations, removed first
+        # through every GenericRelation on Card; a foreign key would make
+        # the raw delete fail on its constraint rather than leave orphans.
+        content_type = ContentType.objects.get_for_model(Card)
+        relations = [
+            relation.related_model
+            for relation in Card._meta.private_fields
+            if isinstance(relation, GenericRelation)
+        ]
+        for batch in batched(missing, self.batch_size):
+            for model in relations:
+                model.objects.filter(
+                    content_type=content_type, object_id__in=batch
+                ).delete()
+            cards = Card.objects.filter(id__in=batch)
+            cards._raw_delete(cards.db)
+        return len(missing)
 
-    def import_data(self, data: list[dict[str, Any]]) -> None:
+    def find_conflicts(
+        self, batch: list[Card], seen: dict[tuple[str, str], int]
+    ) -> list[dict[str, Any]]:
         from cards.models import Card
 
-        cards_bulk: list[Card] = []
-        for row in data:
+        keys = {(card.original, card.translation) for card in batch}
+        existing = Card.objects.filter(
+            module=self.model, original__in={original for original, _ in keys}
+        ).values_list("original", "translation")
+
+        return sorted(
+            (
+                {"row": seen[key], "detail": "Card already exists in this module."}
+                for key in existing
+                if key in keys
+            ),
+            key=lambda error: error["row"],
+        )
+
+    def clean_rows(
+        self,
+        rows: Iterable[dict[str, Any]],
+        errors: list[dict[str, Any]],
+        seen: dict[tuple[str, str], int],
+        mode: ImportMode,
+        summary: dict[str, int],
+    ) -> Iterator[tuple[int, str, str]]:
+        for line, row in enumerate(rows, start=2):
             match row:
                 case {"original": original, "translation": translation}:
-                    cards_bulk.append(
-                        Card(
-                            module=self.model,
-                            original=original,
-                            translation=translation,
+                    key = (str(original), str(translation))
+                    if detail := self.check_values(original, translation):
+                        errors.append({"row": line, "detail": detail})
+                    elif key not in seen:
+                        seen[key] = line
+                        yield line, *key
+                    elif mode != ImportMode.FAIL:
+                        summary["skipped"] += 1
+                    else:
+                        errors.append(
+                            {
+                                "row": line,
+                                "detail": f"Duplicate of row {seen[key]}.",
+                            }
                         )
-                    )
                 case _:
-                    raise ValidationError(
-                        'Each row must have both "original" and "translation" fields.'
+                    errors.append(
+                        {
+                            "row": line,
+                            "detail": 'Each row must have both "original" and '
+                            '"translation" fields.',
+                        }
                     )
+            if len(errors) >= self.max_errors:
+                return
+
+    def check_values(self, original: Any, translation: Any) -> str | None:
+        for field, value in (("original", original), ("translation", translation)):
+            value = "" if value is None else str(value)
+            if not value.strip():
+                return f'"{field}" must not be empty.'
+            if len(value) > self.max_length(field):
+                return f'"{field}" must be at most {self.max_length(field)} characters.'
+        return None
+
+    @staticmethod
+    def max_length(field: str) -> int:
+        from cards.models import Card
+
+        return Card._meta.get_field(field).max_length
+
+    def validate_data(self, rows: Iterable[dict[str, Any]]) -> dict[str, Any]:
+        from cards.models import Card
+
+        mode = self.options.get("mode", ImportMode.FAIL)
+        rows = list(rows)
+        count = len(rows)
+        report: dict[str, Any] = {
+            "valid": False,
+            "rows": count,
+            "summary": {"inserted": 0, "updated": 0, "skipped": 0, "deleted": 0},
+            "error_counts": {},
+            "errors": [],
+            "preview": [],
+        }
+
+        fields = ("original", "translation")
+        if not rows:
+            report["errors"].append({"row": 1, "detail": "The file has no rows."})
+            return report
+
+        missing = [field for field in fields if field not in rows[0]]
+        if missing:
+            report["errors"].append(
+                {
+                    "row": 1,
+                    "detail": f"Missing required columns: {', '.join(missing)}.",
+                }
+            )
+            return report
+
+        columns = {
+            field: np.array(
+                ["" if row.get(field) is None else str(row.get(field)) for row in rows],
+                dtype=np.str_,
+            )
+            for field in fields
+        }
+        lines = np.arange(count) + 2
+        checks: list[tuple[str, np.ndarray, str | np.ndarray]] = []
+
+        invalid = np.zeros(count, dtype=bool)
+        for field in fields:
+            empty = np.char.str_len(np.char.strip(columns[field])) == 0
+            too_long = np.char.str_len(columns[field]) > self.max_length(field)
+            checks.append((f"{field}_empty", empty, f'"{field}" must not be empty.'))
+            checks.append(
+                (
+                    f"{field}_too_long",
+                    too_long & ~empty,
+                    f'"{field}" must be at most {self.max_length(field)} characters.',
+                )
+            )
+            invalid |= empty | too_long
+
+        keys = np.char.add(
+            np.char.add(columns["original"], "\x1f"), columns["translation"]
+        )
+        _, first_index, inverse = np.unique(
+            keys, return_index=True, return_inverse=True
+        )
+        first_seen = first_index[inverse]
+        duplicate = (first_seen != np.arange(count)) & ~invalid
+
+        existing_keys = np.array(
+            [
+                f"{original}\x1f{translation}"
+                for original, translation in Card.objects.filter(
+                    module_id=self.model.card_set_id
+                ).values_list("original", "translation")
+            ],
+            dtype=np.str_,
+        )
+        exists = np.isin(keys, existing_keys) & ~invalid & ~duplicate
+
+        if mode == ImportMode.FAIL:
+            checks.append(
+                (
+                    "duplicate",
+                    duplicate,
+                    np.char.add("Duplicate of row ", (first_seen + 2).astype(np.str_)),
+                )
+            )
+            checks.append(("exists", exists, "Card already exists in this module."))
+
+        errors: list[dict[str, Any]] = []
+        for name, mask, detail in checks:
+            (indices,) = np.nonzero(mask)
+            if not len(indices):
+                continue
+            report["error_counts"][name] = len(indices)
+            for index in indices[: self.report_errors]:
+                message = detail if isinstance(detail, str) else f"{detail[index]}."
+                errors.append({"row": int(lines[index]), "detail": message})
+
+        errors.sort(key=lambda error: error["row"])
+        report["errors"] = errors[: self.report_errors]
+        report["valid"] = not errors
+
+        accepted = ~invalid & ~duplicate & ~exists
+        unchanged = mode in (ImportMode.SKIP, ImportMode.SYNC)
+        report["summary"] = {
+            "inserted": int(accepted.sum()),
+            "updated": int(exists.sum()) if mode == ImportMode.UPDATE else 0,
+            "skipped": int(duplicate.sum()) + (int(exists.sum()) if unchanged else 0),
+            "deleted": (
+                int(np.isin(existing_keys, keys[~invalid], invert=True).sum())
+                if mode == ImportMode.SYNC
+                else 0
+            ),
+        }
+
+        status = np.select(
+            [invalid, duplicate, exists], ["invalid", "duplicate", "exists"], "new"
+        )
+        report["preview"] = [
+            {
+                "row": int(lines[index]),
+                "original": rows[index].get("original"),
+                "translation": rows[index].get("translation"),
+                "status": str(status[index]),
+            }
+            for index in range(min(count, self.preview_rows))
+        ]
+        return report
+
+
+class ModulesMerger(TaskStrategy):
+    perms: list[BasePermission] = [permissions.IsAuthenticated()]
+    background_rows: int = 200_000
+    batch_size: int = 1000
+    merge_batch: int = 10
+
+    @cached_property
+    def card_set_ids(self) -> list[int]:
+        return list(
+            Module.objects.filter(id__in=self.options["modules"])
+            .annotate(card_set=Coalesce("card_source_id", "id"))
+            .order_by("card_set")
+            .values_list("card_set", flat=True)
+            .distinct()
+        )
+
+    def count_rows(self) -> int:
+        from cards.models import Card
+
+        return Card.objects.filter(module_id__in=self.card_set_ids).count()
+
+    def run_task(
+        self, on_progress: Callable[[int], None] | None = None
+    ) -> dict[str, Any]:
+        module_ids = self.options["modules"]
+        lang_from_id, lang_to_id = (
+            Module.objects.filter(id=module_ids[0])
+            .values_list("lang_from_id", "lang_to_id")
+            .get()
+        )
+
+        # Sources are only read, so edits to them are never blocked; the
+        # transaction only holds the rows of the new module
+        with transaction.atomic():
+            module = Module.objects.create(
+                name=self.options["name"],
+                user=self.model,
+                topic_id=self.options["topic"],
+                lang_from_id=lang_from_id,
+                lang_to_id=lang_to_id,
+            )
+
+            inserted = 0
+            for batch in batched(self.card_set_ids, self.merge_batch):
+                if CardBulkLoader.is_supported():
+                    inserted += CardBulkLoader(module.pk).merge_from(batch)
+                else:
+                    inserted += self.merge_cards(module, batch)
+                if on_progress:
+                    on_progress(inserted)
+            Module.add_cards_count(module.pk, inserted)
+
+            if self.options.get("merge_tags"):
+                module.tags.add(
+                    *{
+                        tag
+                        for source in Module.objects.filter(
+                            id__in=module_ids
+                        ).prefetch_related("tags")
+                        for tag in source.tags.all()
+                    }
+                )
+
+        return {"module": module.pk, "inserted": inserted}
+
+    def merge_cards(self, module: Module, card_set_ids: Iterable[int]) -> int:
+        from cards.models import Card
 
-        if cards_bulk:
-            Card.objects.bulk_create(cards_bulk)
+        cards = (
+            Card.objects.filter(module_id__in=card_set_ids)
+            .values_list("original", "translation")
+            .distinct()
+            .iterator(chunk_size=self.batch_size)
+        )
+        before = module.cards.count()
+        for batch in batched(cards, self.batch_size):
+            Card.objects.bulk_create(
+                (
+                    Card(module=module, original=original, translation=translation)
+                    for original, translation in batch
+                ),
+                ignore_conflicts=True,
+            )
+        return module.cards.count() - before
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from cards.models import Card
+from folders.models import Folder
+from generic_status.models import Rate
+from modules.models import Module
+
+if TYPE_CHECKING:
+    from typing import Any
+    from django.core.management.base import CommandParser
+    from django.db.models import Model, QuerySet
+
+
+def aggregate(qs: QuerySet, group_by: str, **aggregates: Any) -> dict[str, Coalesce]:
+    grouped = qs.order_by().values(group_by)
+    return {
+        name: Coalesce(
+            Subquery(
+                grouped.annotate(value=expression).values("value"),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+        for name, expression in aggregates.items()
+    }
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored card, rating and module counters."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        batch_size = options["batch_size"]
+
+        rates = Rate.objects.filter(
+            content_type=ContentType.objects.get_for_model(Module),
+            object_id=OuterRef("pk"),
+        )
+        module_counters = {
+            **aggregate(
+                Card.objects.filter(
+                    module_id=Coalesce(OuterRef("card_source_id"), OuterRef("pk"))
+                ),
+                "module_id",
+                cards_count=Count("id"),
+            ),
+            **aggregate(
+                rates,
+                "object_id",
+                rating_sum=Sum("rate"),
+                rating_count=Count("id"),
+            ),
+        }
+        folder_counters = aggregate(
+            Module.folders.through.objects.filter(
+                folder_id=OuterRef("pk"), module__visible=Module.Status.PUBLIC
+            ),
+            "folder_id",
+            public_modules_count=Count("id"),
+        )
+
+        for model, counters in (
+            (Module, module_counters),
+            (Folder, folder_counters),
+        ):
+            updated = self.rebuild(model, counters, batch_size)
+            self.stdout.write(f"{model.__name__}: {updated} rows rebuilt")
+
+    @staticmethod
+    def rebuild(
+        model: type[Model], counters: dict[str, Coalesce], batch_size: int
+    ) -> int:
+        updated = 0
+        last_id = 0
+        while True:
+            ids = list(
+                model._base_manager.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return updated
+            updated += model._base_manager.filter(pk__in=ids).update(**counters)
+            last_id = ids[-1]
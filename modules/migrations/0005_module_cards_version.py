@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("modules", "0004_module_created"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="module",
+            name="cards_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
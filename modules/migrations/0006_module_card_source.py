@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("modules", "0005_module_cards_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="module",
+            name="card_source",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="card_copies",
+                to="modules.module",
+            ),
+        ),
+    ]
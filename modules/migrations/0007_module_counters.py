@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:33
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def count(qs, group_by, expression):
+    return Coalesce(
+        Subquery(
+            qs.order_by().values(group_by).annotate(value=expression).values("value"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def fill_counters(apps, schema_editor):
+    Module = apps.get_model("modules", "Module")
+    Card = apps.get_model("cards", "Card")
+    Rate = apps.get_model("generic_status", "Rate")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    cards = Card.objects.filter(
+        module_id=Coalesce(OuterRef("card_source_id"), OuterRef("pk"))
+    )
+    rates = Rate.objects.filter(
+        content_type__in=ContentType.objects.filter(
+            app_label="modules", model="module"
+        ),
+        object_id=OuterRef("pk"),
+    )
+    Module.objects.update(
+        cards_count=count(cards, "module_id", Count("id")),
+        rating_sum=count(rates, "object_id", Sum("rate")),
+        rating_count=count(rates, "object_id", Count("id")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("modules", "0006_module_card_source"),
+        ("cards", "0003_card_created"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("generic_status", "0003_alter_perm_unique_together"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="module",
+            name="cards_count",
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="rating_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="module",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:38
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from common.operations import PostgreSQLAddIndex
+
+
+def fill_search_vectors(apps, schema_editor):
+    from modules.search import update_search_vectors
+
+    update_search_vectors(apps.get_model("modules", "Module").objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("folders", "0003_folder_modules_count"),
+        ("languages", "0003_alter_language_flag"),
+        ("modules", "0007_module_counters"),
+        (
+            "taggit",
+            "0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx",
+        ),
+        ("topics", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="module",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        PostgreSQLAddIndex(
+            model_name="module",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="modules_mod_search__200ff3_gin"
+            ),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
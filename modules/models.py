@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models, transaction
 from rest_framework.exceptions import ValidationError
 
@@ -11,10 +15,14 @@ from generic_status.models import Permable, Rateable
 from generic_status.queryset import AnnotatePermMixin, AnnotateRatedMixin
 from interactions.models import Savable, Pinnable
 from interactions.queryset import AnnotateSavedMixin, AnnotatePinnedMixin
+from io_manager.utils import batched
+from modules.cache import CARD_SET_COPY_BATCH
 from users.models import User
 
 if TYPE_CHECKING:
     from typing import Any
+    from django.db.models import Manager, QuerySet
+    from cards.models import Card
 
 
 class Module(Tag, Visible, Savable, Pinnable, Permable, Rateable, models.Model):
@@ -26,6 +34,17 @@ class Module(Tag, Visible, Savable, Pinnable, Permable, Rateable, models.Model):
     description = models.TextField(blank=True, null=True)
 
     created = models.DateTimeField(auto_now_add=True)
+    cards_version = models.PositiveIntegerField(default=0, editable=False)
+    cards_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+    card_source = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="card_copies",
+    )
+    search_vector = SearchVectorField(null=True, editable=False)
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="modules")
     topic = models.ForeignKey(
@@ -42,6 +61,7 @@ class Module(Tag, Visible, Savable, Pinnable, Permable, Rateable, models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [GinIndex(fields=["search_vector"])]
 
     def clean(self) -> None:
         if self.lang_from == self.lang_to:
@@ -54,26 +74,127 @@ class Module(Tag, Visible, Savable, Pinnable, Permable, Rateable, models.Model):
     def __str__(self) -> str:
         return self.name
 
-    def copy(self, new_user: User) -> None:
-        from cards.models import Card
+    @classmethod
+    def bump_cards_version(cls, *module_ids: int) -> None:
+        cls.objects.filter(pk__in=module_ids).update(
+            cards_version=models.F("cards_version") + 1
+        )
+
+    @classmethod
+    def add_cards_count(cls, module_id: int, count: int) -> None:
+        cls.objects.filter(pk=module_id).update(
+            cards_count=models.F("cards_count") + count,
+            cards_version=models.F("cards_version") + 1,
+        )
+
+    @property
+    def card_set_id(self) -> int:
+        return self.card_source_id or self.pk
+
+    @property
+    def card_set(self) -> Manager[Card]:
+        return self.card_source.cards if self.card_source_id else self.cards
+
+    @classmethod
+    def shares_cards(cls, module_id: int) -> bool:
+        return cls.objects.filter(
+            models.Q(pk=module_id, card_source__isnull=False)
+            | models.Q(card_source_id=module_id)
+        ).exists()
+
+    def copy(self, new_user: User) -> Module:
+        return Module.objects.create(
+            name=self.name,
+            user=new_user,
+            topic=self.topic,
+            lang_from=self.lang_from,
+            lang_to=self.lang_to,
+            card_source_id=self.card_set_id,
+            cards_count=self.cards_count,
+        )
+
+    def prepare_cards_write(self) -> None:
+        # The shared set never changes under the copies reading it: a copy
+        # takes its own cards and a source hands the copies a set of theirs
+        self.materialize_cards()
+        self.release_card_copies()
+
+    def materialize_cards(self) -> None:
+        if not self.card_source_id:
+            return
 
         with transaction.atomic():
-            new_module = Module.objects.create(
-                name=self.name,
-                user=new_user,
-                topic=self.topic,
-                lang_from=self.lang_from,
-                lang_to=self.lang_to,
+            source_id = self.card_source_id
+            claimed = (
+                Module.objects.select_for_update()
+                .filter(pk=self.pk, card_source_id=source_id)
+                .exists()
             )
+            self.card_source_id = None
+            if claimed:
+                self.take_card_set(source_id)
 
-            cards_bulk = [
-                Card(
-                    module=new_module,
-                    original=card.original,
-                    translation=card.translation,
-                )
-                for card in self.cards.all()
+    def release_card_copies(self, copies: QuerySet[Module] | None = None) -> None:
+        with transaction.atomic():
+            Module.objects.select_for_update().filter(pk=self.pk).exists()
+            if copies is None:
+                copies = self.card_copies.all()
+            heir = copies.order_by("created", "pk").first()
+            if heir is None:
+                return
+
+            # One new set serves every copy, however many there are
+            heir.take_card_set(self.pk)
+            copies.exclude(pk=heir.pk).update(card_source=heir)
+
+    def take_card_set(self, source_id: int) -> None:
+        from cards.models import Card
+
+        shared = list(
+            Card.objects.filter(module_id=source_id)
+            .order_by("id")
+            .values_list("id", "original", "translation")
+        )
+        created = Card.objects.bulk_create(
+            (
+                Card(module=self, original=original, translation=translation)
+                for _, original, translation in shared
+            ),
+            batch_size=CARD_SET_COPY_BATCH,
+        )
+        card_ids = {old[0]: card.pk for old, card in zip(shared, created)}
+
+        # Nobody can tell which module a card was studied through, so every
+        # user's learn/save/review state is kept on both sets
+        for relation in Card._meta.private_fields:
+            if not isinstance(relation, GenericRelation):
+                continue
+            model = relation.related_model
+            fields = [
+                field.attname
+                for field in model._meta.concrete_fields
+                if not field.primary_key and field.attname != "object_id"
             ]
+            rows = model.objects.filter(
+                content_type=ContentType.objects.get_for_model(Card),
+                object_id__in=Card.objects.filter(module_id=source_id).values("pk"),
+            ).iterator(chunk_size=CARD_SET_COPY_BATCH)
+            for batch in batched(rows, CARD_SET_COPY_BATCH):
+                model.objects.bulk_create(
+                    (
+                        model(
+                            object_id=card_ids[row.object_id],
+                            **{field: getattr(row, field) for field in fields},
+                        )
+                        for row in batch
+                        if row.object_id in card_ids
+                    ),
+                    ignore_conflicts=True,
+                )
 
-            if cards_bulk:
-                Card.objects.bulk_create(cards_bulk)
+        Module.objects.filter(pk=self.pk).update(
+            card_source=None,
+            cards_count=len(created),
+            cards_version=models.F("cards_version") + 1,
+        )
+        self.card_source_id = None
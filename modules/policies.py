@@ -42,9 +42,12 @@ COPIES_POLICY = PINS_POLICY
 
 MODULE_MERGE_POLICY = PINS_POLICY
 
+PROGRESS_POLICY = [IsAuthenticated]
+
 
 POLICIES = {
     "retrieve": RETRIEVE_POLICY,
+    "cards": RETRIEVE_POLICY,
     "list": LIST_POLICY,
     "create": CREATE_POLICY,
     "update": UPDATE_POLICY,
@@ -54,4 +57,5 @@ POLICIES = {
     "pins": PINS_POLICY,
     "rates": RATES_POLICY,
     "copies": COPIES_POLICY,
+    "progress": PROGRESS_POLICY,
 }
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Subquery
+from redis.exceptions import RedisError
+
+from cards.models import Card
+from common.write_behind import WriteBehindBuffer
+from generic_status.models import Learn
+from modules.cache import CACHE_PROGRESS_KEY, CACHE_PROGRESS_TTL
+
+if TYPE_CHECKING:
+    from typing import Iterable
+    from django.contrib.auth.models import AnonymousUser
+    from modules.models import Module
+    from users.models import User
+
+
+class ModuleProgress:
+    # Learned and in progress counts per card set, copies share their source's
+    def __init__(self, user: User | AnonymousUser) -> None:
+        self.user = user
+
+    @staticmethod
+    def key(user_id: int, card_set_id: int) -> str:
+        return CACHE_PROGRESS_KEY.format(user_id=user_id, card_set_id=card_set_id)
+
+    @classmethod
+    def invalidate(cls, user_id: int, card_set_ids: Iterable[int]) -> None:
+        try:
+            cache.delete_many([cls.key(user_id, pk) for pk in card_set_ids])
+        except RedisError:
+            pass
+
+    def for_modules(self, modules: Iterable[Module]) -> dict[int, dict[str, int]]:
+        modules = list(modules)
+        counts = self.counts({module.card_set_id for module in modules})
+        progress = {}
+        for module in modules:
+            learned = counts[module.card_set_id][Learn.Status.LEARNED]
+            in_progress = counts[module.card_set_id][Learn.Status.IN_PROGRESS]
+            progress[module.pk] = {
+                "total": module.cards_count,
+                "learned": learned,
+                "in_progress": in_progress,
+                "untouched": max(module.cards_count - learned - in_progress, 0),
+            }
+        return progress
+
+    def counts(self, card_set_ids: set[int]) -> dict[int, Counter]:
+        if not self.user.is_authenticated or not card_set_ids:
+            return {pk: Counter() for pk in card_set_ids}
+
+        # The counts are only a cache, without Redis they come from the database
+        keys = {self.key(self.user.pk, pk): pk for pk in card_set_ids}
+        try:
+            cached = cache.get_many(keys)
+        except RedisError:
+            cached = {}
+        counts = {keys[key]: Counter(value) for key, value in cached.items()}
+        missing = card_set_ids - counts.keys()
+        if missing:
+            computed = self.compute(missing)
+            try:
+                cache.set_many(
+                    {self.key(self.user.pk, pk): dict(computed[pk]) for pk in missing},
+                    CACHE_PROGRESS_TTL,
+                )
+            except RedisError:
+                pass
+            counts.update(computed)
+        return counts
+
+    def compute(self, card_set_ids: set[int]) -> dict[int, Counter]:
+        # Unflushed learn changes are read before the rows they replace
+        buffer = WriteBehindBuffer.connect(Learn)
+        changes = {}
+        if buffer is not None:
+            content_type_id = ContentType.objects.get_for_model(Card).id
+            changes = buffer.changes(Learn, self.user.pk, content_type_id)
+
+        counts = {pk: Counter() for pk in card_set_ids}
+        rows = (
+            Card.objects.filter(module_id__in=card_set_ids, learns__user=self.user)
+            .order_by()
+            .values_list("module_id", "learns__learned")
+            .annotate(count=Count("pk"))
+        )
+        for card_set_id, status, count in rows:
+            counts[card_set_id][status] = count
+
+        if changes:
+            stored = Learn.objects.filter(
+                user=self.user,
+                content_type=ContentType.objects.get_for_model(Card),
+                object_id=OuterRef("pk"),
+            ).values("learned")[:1]
+            buffered = Card.objects.filter(
+                pk__in=changes, module_id__in=card_set_ids
+            ).values_list("pk", "module_id", Subquery(stored))
+            for pk, card_set_id, status in buffered:
+                if status:
+                    counts[card_set_id][status] -= 1
+                if changes[pk] is not None:
+                    counts[card_set_id][changes[pk]["learned"]] += 1
+        return counts
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from django.db.models import Count, Prefetch, QuerySet, Avg
+from django.db.models import FloatField, Func, QuerySet
+from django.db.models.functions import Cast, NullIf
 
 from cards.models import Card
 from common.access_chain import AccessibleChain
@@ -10,36 +11,24 @@ from common.permissions import get_accessible_q
 from modules.models import Module
 
 if TYPE_CHECKING:
-    from users.models import User
     from typing import Type
     from rest_framework.request import Request
 
 
 class ModuleRepository:
+    @staticmethod
+    def avg_rate() -> Func:
+        return Cast("rating_sum", FloatField()) / NullIf("rating_count", 0)
+
     @staticmethod
     def base_qs() -> QuerySet[Module]:
         return Module.objects.select_related(
             "user", "topic", "lang_from", "lang_to"
-        ).annotate(cards_count=Count("cards", distinct=True), avg_rate=Avg("rates__rate"))
+        ).annotate(avg_rate=ModuleRepository.avg_rate())
 
     @staticmethod
-    def with_cards_and_annotations(
-        qs: QuerySet[Module], user: User
-    ) -> QuerySet[Module]:
-        return (
-            qs.prefetch_related(
-                Prefetch(
-                    "cards",
-                    queryset=Card.objects.all()
-                    .with_ann_saved(user)
-                    .with_ann_learned(user),
-                ),
-            )
-            .with_ann_saved(user)
-            .with_ann_pinned(user)
-            .with_ann_rate(user)
-            .with_ann_perm(user)
-        )
+    def cards_of(module: Module) -> QuerySet[Card]:
+        return Card.objects.filter(module_id=module.card_set_id)
 
     @staticmethod
     def accessible_for_user(
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import OuterRef, Subquery, TextField
+
+if TYPE_CHECKING:
+    from modules.models import Module
+    from typing import Iterable, Type
+    from django.db.models import QuerySet
+
+# Text search configurations shipped with PostgreSQL, by language code
+SEARCH_CONFIGS: dict[str, str] = {
+    "AR": "arabic",
+    "DA": "danish",
+    "DE": "german",
+    "EL": "greek",
+    "EN": "english",
+    "ES": "spanish",
+    "FI": "finnish",
+    "FR": "french",
+    "GA": "irish",
+    "HI": "hindi",
+    "HU": "hungarian",
+    "ID": "indonesian",
+    "IT": "italian",
+    "LT": "lithuanian",
+    "NL": "dutch",
+    "NO": "norwegian",
+    "PT": "portuguese",
+    "RO": "romanian",
+    "RU": "russian",
+    "SR": "serbian",
+    "SV": "swedish",
+    "TA": "tamil",
+    "TR": "turkish",
+}
+DEFAULT_SEARCH_CONFIG = "simple"
+SEARCH_FIELDS = {
+    "name",
+    "description",
+    "lang_from",
+    "lang_from_id",
+    "lang_to",
+    "lang_to_id",
+}
+
+
+def search_configs(*language_codes: str) -> list[str]:
+    configs = [DEFAULT_SEARCH_CONFIG]
+    for code in language_codes:
+        config = SEARCH_CONFIGS.get(code, DEFAULT_SEARCH_CONFIG)
+        if config not in configs:
+            configs.append(config)
+    return configs
+
+
+def module_search_vector(model: Type[Module], configs: Iterable[str]) -> SearchVector:
+    from taggit.models import TaggedItem
+
+    tags = Subquery(
+        TaggedItem.objects.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id=OuterRef("pk"),
+        )
+        .order_by()
+        .values("object_id")
+        .annotate(names=StringAgg("tag__name", " "))
+        .values("names"),
+        output_field=TextField(),
+    )
+
+    # Unstemmed words always match, stems follow the module's languages
+    vector = None
+    for config in configs:
+        for part, weight in (("name", "A"), ("description", "B"), (tags, "C")):
+            part_vector = SearchVector(part, config=config, weight=weight)
+            vector = part_vector if vector is None else vector + part_vector
+    return vector
+
+
+def update_search_vectors(modules: QuerySet[Module]) -> None:
+    # Other backends have no search vectors to keep up to date
+    if connection.vendor != "postgresql":
+        return
+
+    pairs = (
+        modules.order_by().values_list("lang_from__code", "lang_to__code").distinct()
+    )
+    for lang_from, lang_to in pairs:
+        configs = search_configs(lang_from, lang_to)
+        modules.model.objects.filter(
+            pk__in=modules.filter(
+                lang_from__code=lang_from, lang_to__code=lang_to
+            ).values("pk")
+        ).update(search_vector=module_search_vector(modules.model, configs))
+
+
+def search_query(text: str, language_codes: Iterable[str]) -> SearchQuery:
+    query = None
+    for config in search_configs(*language_codes):
+        part_query = SearchQuery(text, config=config, search_type="websearch")
+        query = part_query if query is None else query | part_query
+    return query
@@ -3,15 +3,22 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from django.db import transaction
+from django.db.models import Q
 from rest_framework import serializers
 from taggit.serializers import TagListSerializerField
 
+from abstracts.models import Visible
 from cards.serializers import (
     CardShortSerializer,
     CardCreateRelatedSerializer,
 )
+from common.permissions import get_accessible_q
+from common.user_state import UserStateBooleanField, UserStateCharField
+from folders.models import Folder
 from languages.serializers import LanguageShortSerializer, LanguageSerializer
+from modules.cache import PROGRESS_MAX_MODULES
 from modules.models import Module
+from modules.service import ModuleService
 from topics.models import Topic
 from topics.serializers import TopicSerializer
 from users.serializers import UserPublicSerializer
@@ -20,6 +27,25 @@ if TYPE_CHECKING:
     from typing import Any
 
 
+class ModuleProgressSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    learned = serializers.IntegerField()
+    in_progress = serializers.IntegerField()
+    untouched = serializers.IntegerField()
+
+
+class ModuleProgressItemSerializer(ModuleProgressSerializer):
+    module = serializers.IntegerField()
+
+
+class ModuleProgressQuerySerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=PROGRESS_MAX_MODULES,
+    )
+
+
 class ModuleListSerializer(serializers.ModelSerializer):
     user = UserPublicSerializer(read_only=True)
     lang_from = LanguageShortSerializer(read_only=True)
@@ -33,6 +59,8 @@ class ModuleListSerializer(serializers.ModelSerializer):
         decimal_places=1,
         coerce_to_string=False
     )
+    # Only present when the list is requested with ?progress=true
+    progress = ModuleProgressSerializer(read_only=True)
 
     class Meta:
         model = Module
@@ -46,6 +74,7 @@ class ModuleListSerializer(serializers.ModelSerializer):
             "topic",
             "cards_count",
             "avg_rate",
+            "progress",
         ]
 
 
@@ -86,7 +115,9 @@ class ModuleCreatePutSerializer(serializers.ModelSerializer):
         unique_cards = {(card["original"], card["translation"]) for card in cards_data}
 
         with transaction.atomic():
-            module = Module.objects.create(**validated_data)
+            module = Module.objects.create(
+                **validated_data, cards_count=len(unique_cards)
+            )
 
             if unique_cards:
                 from cards.models import Card
@@ -101,6 +132,11 @@ class ModuleCreatePutSerializer(serializers.ModelSerializer):
             return module
 
 
+class ModuleCardsPageSerializer(serializers.Serializer):
+    next = serializers.URLField(allow_null=True)
+    results = CardShortSerializer(many=True)
+
+
 class ModuleDetailSerializer(serializers.ModelSerializer):
     user = UserPublicSerializer(read_only=True)
     lang_from = LanguageSerializer(read_only=True)
@@ -109,14 +145,14 @@ class ModuleDetailSerializer(serializers.ModelSerializer):
 
     tags = TagListSerializerField()
 
-    cards = CardShortSerializer(many=True, read_only=True)
+    cards = ModuleCardsPageSerializer(source="cards_page", read_only=True)
     cards_count = serializers.IntegerField(read_only=True)
 
-    saved = serializers.BooleanField()
-    pinned = serializers.BooleanField()
+    saved = UserStateBooleanField()
+    pinned = UserStateBooleanField()
 
-    user_rate = serializers.CharField()
-    user_perm = serializers.CharField()
+    user_rate = UserStateCharField()
+    user_perm = UserStateCharField()
 
     class Meta:
         model = Module
@@ -142,8 +178,9 @@ class ModuleMergeSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=100)
     topic = serializers.PrimaryKeyRelatedField(queryset=Topic.objects.all())
     modules = serializers.ListField(
-        child=serializers.IntegerField(), min_length=2, max_length=5
+        child=serializers.IntegerField(), min_length=2, max_length=50
     )
+    merge_tags = serializers.BooleanField(default=False)
 
     def validate_modules(self, module_ids: list[int]) -> list[Module]:
         modules = list(Module.objects.filter(id__in=module_ids).select_related("lang_from", "lang_to"))
@@ -158,3 +195,46 @@ class ModuleMergeSerializer(serializers.Serializer):
             )
 
         return modules
+
+
+class ModuleArchiveOptionsSerializer(serializers.Serializer):
+    folder = serializers.IntegerField(required=False)
+    modules = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=1000
+    )
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        request = self.context["request"]
+        folder_id = attrs.get("folder")
+        module_ids = attrs.get("modules")
+
+        if folder_id is not None and module_ids:
+            raise serializers.ValidationError(
+                "Pass either a folder or a list of modules, not both"
+            )
+
+        accessible = Module.objects.filter(
+            get_accessible_q(request, ModuleService.LIST_ACTION_CHAIN_LINKS)
+        )
+
+        if folder_id is not None:
+            folder = Folder.objects.filter(
+                Q(user=request.user) | Q(visible=Visible.Status.PUBLIC), pk=folder_id
+            ).first()
+            if folder is None:
+                raise serializers.ValidationError({"folder": "Folder not found"})
+            modules = accessible.filter(folders=folder)
+        elif module_ids:
+            modules = accessible.filter(id__in=module_ids)
+        else:
+            modules = Module.objects.filter(user=request.user)
+
+        ids = sorted(modules.values_list("id", flat=True).distinct())
+        if module_ids and len(ids) != len(set(module_ids)):
+            raise serializers.ValidationError(
+                {"modules": "Some modules were not found"}
+            )
+        if not ids:
+            raise serializers.ValidationError("There are no modules to export")
+
+        return {"modules": ids}
@@ -29,15 +29,9 @@ class ModuleService:
     def get_queryset(self):
         qs = ModuleRepository.base_qs()
 
-        if self.action in {"list", "retrieve"}:
-            user = self.request.user
-
-            if self.action == "retrieve":
-                qs = ModuleRepository.with_cards_and_annotations(qs, user)
-
-            elif self.action == "list":
-                qs = ModuleRepository.accessible_for_user(
-                    qs, self.request, self.LIST_ACTION_CHAIN_LINKS
-                )
+        if self.action == "list":
+            qs = ModuleRepository.accessible_for_user(
+                qs, self.request, self.LIST_ACTION_CHAIN_LINKS
+            )
 
         return qs
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db import models
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from modules.models import Module
+from modules.search import SEARCH_FIELDS, update_search_vectors
+
+if TYPE_CHECKING:
+    from typing import Any, Type
+    from django.db.models import Model
+
+
+@receiver(pre_delete, sender=Module)
+def detach_card_copies(sender: Type[Model], instance: Module, **kwargs: Any) -> None:
+    copies = instance.card_copies.all()
+
+    # Copies removed by the same delete have nothing left to keep
+    origin = kwargs.get("origin")
+    if isinstance(origin, models.QuerySet):
+        origin_model, origin_ids = origin.model, origin.values("pk")
+    else:
+        origin_model, origin_ids = type(origin), [origin.pk]
+    if origin_model is Module:
+        copies = copies.exclude(pk__in=origin_ids)
+    for field in Module._meta.concrete_fields:
+        if (
+            field.related_model is origin_model
+            and field.remote_field.on_delete is models.CASCADE
+        ):
+            copies = copies.exclude(**{f"{field.name}__in": origin_ids})
+
+    instance.release_card_copies(copies)
+
+
+@receiver(post_save, sender=Module)
+def index_saved_module(
+    sender: Type[Model],
+    instance: Module,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    if update_fields is None or SEARCH_FIELDS & update_fields:
+        update_search_vectors(Module.objects.filter(pk=instance.pk))
+
+
+@receiver(m2m_changed, sender=Module.tags.through)
+def index_module_tags(
+    sender: Type[Model], instance: Model, action: str, **kwargs: Any
+) -> None:
+    if isinstance(instance, Module) and action in {
+        "post_add",
+        "post_remove",
+        "post_clear",
+    }:
+        update_search_vectors(Module.objects.filter(pk=instance.pk))
@@ -0,0 +1,36 @@
+from celery import shared_task
+from django_redis import get_redis_connection
+
+from io_manager.bridge import ModelIOBridge
+from io_manager.formats import FormatRegistry
+from modules.cache import (
+    CACHE_POPULAR_EXPORTS_KEY,
+    CACHE_POPULAR_EXPORTS_SIZE,
+    PRERENDER_EXPORTS_LIMIT,
+)
+from modules.io import ModuleCardsExporter
+from modules.models import Module
+
+
+@shared_task
+def prerender_popular_exports(limit: int = PRERENDER_EXPORTS_LIMIT) -> int:
+    try:
+        redis = get_redis_connection("default")
+    except NotImplementedError:
+        return 0
+
+    module_ids = [
+        int(module_id)
+        for module_id in redis.zrevrange(CACHE_POPULAR_EXPORTS_KEY, 0, limit - 1)
+    ]
+    redis.zremrangebyrank(CACHE_POPULAR_EXPORTS_KEY, 0, -CACHE_POPULAR_EXPORTS_SIZE - 1)
+
+    rendered = 0
+    modules = Module.objects.filter(id__in=module_ids, visible=Module.Status.PUBLIC)
+    for module in modules:
+        for file_format in ("csv", "xlsx"):
+            bridge = ModelIOBridge(
+                ModuleCardsExporter(module), FormatRegistry.get(file_format)
+            )
+            rendered += bridge.prerender()
+    return rendered
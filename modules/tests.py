@@ -0,0 +1,82 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APITestCase
+
+from cards.models import Card
+from generic_status.models import Learn
+from languages.models import Language
+from modules.models import Module
+from topics.models import Topic
+from users.models import User
+
+
+class ModuleCardsImportTests(APITestCase):
+    def setUp(self) -> None:
+        self.owner = User.objects.create(username="owner", email="owner@x.io")
+        self.module = Module.objects.create(
+            name="Private",
+            user=self.owner,
+            topic=Topic.objects.create(name="General"),
+            lang_from=Language.objects.create(code="EN", name="English"),
+            lang_to=Language.objects.create(code="DE", name="German"),
+            visible=Module.Status.PRIVATE,
+        )
+        Card.objects.create(module=self.module, original="hund", translation="dog")
+
+    def import_file(self, content: bytes, **options: str):
+        return self.client.post(
+            f"/api/v1/modules/{self.module.pk}/import/",
+            {"file": SimpleUploadedFile("cards.csv", content), **options},
+            format="multipart",
+        )
+
+    def test_owner_dry_run_reports_existing_cards(self) -> None:
+        self.client.force_authenticate(self.owner)
+
+        response = self.import_file(
+            b"original,translation\nhund,dog\nkatze,cat\n", dry_run="true"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["summary"]["inserted"], 1)
+        self.assertEqual(self.module.cards.count(), 1)
+
+    def test_non_owner_dry_run_is_forbidden(self) -> None:
+        self.client.force_authenticate(
+            User.objects.create(username="stranger", email="stranger@x.io")
+        )
+
+        response = self.import_file(b"original,translation\nhund,dog\n", dry_run="true")
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_sync_import_updates_counters_and_removes_card_state(self) -> None:
+        kept = self.module.cards.get()
+        removed = Card.objects.create(
+            module=self.module, original="maus", translation="mouse"
+        )
+        for card in (kept, removed):
+            Learn.objects.create(
+                user=self.owner,
+                content_type=ContentType.objects.get_for_model(Card),
+                object_id=card.pk,
+                learned=Learn.Status.LEARNED,
+            )
+        self.module.refresh_from_db()
+        version = self.module.cards_version
+        self.client.force_authenticate(self.owner)
+
+        response = self.import_file(
+            b"original,translation\nhund,dog\nkatze,cat\n", mode="sync"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["summary"]["inserted"], 1)
+        self.assertEqual(response.data["summary"]["deleted"], 1)
+        self.module.refresh_from_db()
+        self.assertEqual(self.module.cards_count, 2)
+        self.assertEqual(self.module.cards.count(), 2)
+        self.assertGreater(self.module.cards_version, version)
+        self.assertEqual(
+            list(Learn.objects.values_list("object_id", flat=True)), [kept.pk]
+        )
@@ -1,9 +1,17 @@
 from django.urls import path
-from drf_spectacular.utils import extend_schema_view, extend_schema
+from drf_spectacular.utils import (
+    extend_schema_view,
+    extend_schema,
+    OpenApiParameter,
+)
 from rest_framework.routers import DefaultRouter
 
-from io_manager.views import GenericImportView, GenericExportView
-from .io import ModuleCardsImporter, ModuleCardsExporter
+from io_manager.views import (
+    GenericArchiveExportView,
+    GenericExportView,
+    GenericImportView,
+)
+from .io import ModuleCardsImporter, ModuleCardsExporter, ModulesArchiveExporter
 from .models import Module
 from .views import ModuleViewSet, ModuleMergeView
 
@@ -31,6 +39,37 @@ generic_urls = [
         ),
         name="module-cards-export",
     ),
+    path(
+        "modules/export/",
+        extend_schema_view(
+            get=extend_schema(
+                tags=["modules"],
+                operation_id="modules_archive_export",
+                parameters=[
+                    OpenApiParameter(
+                        name="folder",
+                        description="Export every module in this folder.",
+                        required=False,
+                        type=int,
+                    ),
+                    OpenApiParameter(
+                        name="modules",
+                        description="Export these modules. Defaults to all your "
+                        "own modules when neither this nor `folder` is given.",
+                        required=False,
+                        type={"type": "array", "items": {"type": "integer"}},
+                        explode=True,
+                    ),
+                ],
+            )
+        )(
+            GenericArchiveExportView.as_view(
+                strategy=ModulesArchiveExporter,
+                filename="modules",
+            )
+        ),
+        name="modules-archive-export",
+    ),
 ]
 
 module_merge_urls = [
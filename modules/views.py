@@ -2,23 +2,39 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
+from drf_spectacular.utils import (
+    extend_schema,
+    OpenApiExample,
+    OpenApiParameter,
+    OpenApiResponse,
+)
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
 from abstracts.views import TagMixin, VisibleMixin
-from cards.models import Card
+from cards.filters import CardFilter
+from cards.pagination import CardKeysetPagination
+from cards.serializers import CardShortSerializer
 from common.exeptions import UnRegisteredPolicy
+from common.permissions import get_accessible_q
 from common.policy import PolicyRegistry
+from common.views import UserStateMixin
 from generic_status.views import RateMixin, PermMixin
 from interactions.views import PinMixin, SaveMixin
+from io_manager.models import IOJob
+from io_manager.serializers import IOJobSerializer
+from io_manager.views import ASYNC_PARAMETER, BackgroundJobMixin
+from modules.io import ModulesMerger
 from modules.filters import ModuleFilter
 from modules.models import Module
 from modules.pagination import ModulePagination
+from modules.progress import ModuleProgress
+from modules.repository import ModuleRepository
 from modules.policies import MODULE_MERGE_POLICY
 from modules.serializers import (
     ModuleListSerializer,
@@ -26,12 +42,15 @@ from modules.serializers import (
     ModuleMergeSerializer,
     ModuleCreatePutSerializer,
     ModulePatchSerializer,
+    ModuleProgressItemSerializer,
+    ModuleProgressQuerySerializer,
 )
 from modules.service import ModuleService
 
 if TYPE_CHECKING:
-    from typing import Type
-    from django.db.models import QuerySet
+    from typing import Any, Type
+    from django.db.models import Model, QuerySet
+    from cards.models import Card
     from rest_framework.serializers import Serializer, ModelSerializer
     from rest_framework.request import Request
     from rest_framework.permissions import BasePermission
@@ -39,6 +58,7 @@ if TYPE_CHECKING:
 
 @extend_schema(tags=["modules"])
 class ModuleViewSet(
+    UserStateMixin,
     PinMixin,
     SaveMixin,
     TagMixin,
@@ -53,6 +73,7 @@ class ModuleViewSet(
     serializer_class = ModuleListSerializer
     saves_serializer_class = ModuleListSerializer
     pins_serializer_class = ModuleListSerializer
+    bulk_access_links = ModuleService.LIST_ACTION_CHAIN_LINKS
     policies = PolicyRegistry()
 
     def get_queryset(self) -> QuerySet[Module]:
@@ -83,6 +104,117 @@ class ModuleViewSet(
     def perform_create(self, serializer: ModelSerializer) -> None:
         serializer.save(user=self.request.user)
 
+    def wants_progress(self) -> bool:
+        return self.action == "list" and self.request.query_params.get(
+            "progress", ""
+        ).lower() in {"1", "true"}
+
+    def paginate_queryset(self, queryset: QuerySet) -> list[Module] | None:
+        page = super().paginate_queryset(queryset)
+        if page is not None and self.wants_progress():
+            # One grouped query for the whole page
+            progress = ModuleProgress(self.request.user).for_modules(page)
+            for module in page:
+                module.progress = progress[module.pk]
+        return page
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "progress",
+                bool,
+                description="Include the user's learning progress of each module",
+            )
+        ]
+    )
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return super().list(request, *args, **kwargs)
+
+    def get_user_state_objects(self, objects: list[Module]) -> list[Model]:
+        if self.action == "retrieve":
+            # The embedded cards page is overlaid together with the module
+            return [*objects, *objects[0].cards_page["results"]]
+        return objects
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        module = self.get_object()
+
+        # Only the first page of cards is embedded, the rest is browsed
+        # through the cards action
+        paginator = CardKeysetPagination()
+        page = paginator.paginate_queryset(ModuleRepository.cards_of(module), request)
+        paginator.base_url = reverse("modules-cards", args=[module.pk], request=request)
+        module.cards_page = {"next": paginator.get_next_link(), "results": page}
+
+        serializer = self.get_serializer(module)
+        return Response(serializer.data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("original", str, description="Substring of the original"),
+            OpenApiParameter(
+                "translation", str, description="Substring of the translation"
+            ),
+            OpenApiParameter(
+                "ordering",
+                str,
+                enum=[
+                    "original",
+                    "-original",
+                    "translation",
+                    "-translation",
+                    "created",
+                    "-created",
+                ],
+            ),
+        ],
+        responses={200: CardShortSerializer(many=True)},
+        filters=False,
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        pagination_class=CardKeysetPagination,
+    )
+    def cards(self, request: Request, pk: str | None = None) -> Response:
+        module = self.get_object()
+        page = self.paginate_queryset(self.filter_cards(module))
+        serializer = CardShortSerializer(
+            page, many=True, context=self.get_user_state_context(page)
+        )
+        return self.get_paginated_response(serializer.data)
+
+    def filter_cards(self, module: Module) -> QuerySet[Card]:
+        filterset = CardFilter(
+            self.request.query_params,
+            queryset=ModuleRepository.cards_of(module),
+            request=self.request,
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        return filterset.qs
+
+    @extend_schema(
+        parameters=[ModuleProgressQuerySerializer],
+        responses={200: ModuleProgressItemSerializer(many=True)},
+        filters=False,
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def progress(self, request: Request) -> Response:
+        params = ModuleProgressQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        # Modules the user can't see are left out
+        modules = Module.objects.filter(
+            get_accessible_q(request, ModuleService.LIST_ACTION_CHAIN_LINKS),
+            pk__in=params.validated_data["ids"],
+        ).only("pk", "card_source_id", "cards_count")
+        progress = ModuleProgress(request.user).for_modules(modules)
+        serializer = ModuleProgressItemSerializer(
+            [{"module": pk, **counts} for pk, counts in progress.items()], many=True
+        )
+        return Response(serializer.data)
+
     @extend_schema(request=None, responses={201: None, 404: None}, methods=["POST"])
     @action(
         detail=True,
@@ -96,9 +228,14 @@ class ModuleViewSet(
 
 @extend_schema(
     tags=["modules"],
+    parameters=[ASYNC_PARAMETER],
     request=ModuleMergeSerializer,
     responses={
-        201: None,
+        201: OpenApiResponse(
+            description="Merged module id and the number of cards inserted",
+            examples=[OpenApiExample("Merged", value={"module": 42, "inserted": 1830})],
+        ),
+        202: OpenApiResponse(IOJobSerializer, description="Merge job queued"),
         400: OpenApiResponse(
             examples=[
                 OpenApiExample(
@@ -123,7 +260,7 @@ class ModuleViewSet(
         ),
     },
 )
-class ModuleMergeView(APIView):
+class ModuleMergeView(BackgroundJobMixin, APIView):
     def get_permissions(self) -> list[BasePermission]:
         return [perm() for perm in MODULE_MERGE_POLICY]
 
@@ -131,41 +268,27 @@ class ModuleMergeView(APIView):
         serializer = ModuleMergeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        name = serializer.validated_data["name"]
-        topic = serializer.validated_data["topic"]
         modules = serializer.validated_data["modules"]
 
         for module in modules:
             self.check_object_permissions(request, module)
 
-        with transaction.atomic():
-            locked_modules = Module.objects.select_for_update().filter(
-                id__in=[m.id for m in modules]
-            )
-
-            new_module = Module.objects.create(
-                name=name,
-                user=request.user,
-                topic=topic,
-                lang_from=modules[0].lang_from,
-                lang_to=modules[0].lang_to,
-            )
-
-            unique_cards = (
-                Card.objects.filter(module__in=locked_modules)
-                .values("original", "translation")
-                .distinct()
-            )
+        options = {
+            "name": serializer.validated_data["name"],
+            "topic": serializer.validated_data["topic"].pk,
+            "modules": [module.pk for module in modules],
+            "merge_tags": serializer.validated_data["merge_tags"],
+        }
+        merger = ModulesMerger(request.user, **options)
 
-            Card.objects.bulk_create(
-                [
-                    Card(
-                        module=new_module,
-                        original=card["original"],
-                        translation=card["translation"],
-                    )
-                    for card in unique_cards
-                ]
+        if self.wants_background(request) or merger.should_run_in_background():
+            return self.enqueue_job(
+                request,
+                IOJob.Kind.MERGE,
+                ModulesMerger,
+                "",
+                request.user,
+                options=options,
             )
 
-        return Response(status=status.HTTP_201_CREATED)
+        return Response(merger.run_task(), status=status.HTTP_201_CREATED)
@@ -2,6 +2,8 @@ import os
 from celery import app as celery_app
 from celery.schedules import crontab
 
+from common.cache import WRITE_BEHIND_FLUSH_INTERVAL
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "qz.settings")
 app = celery_app.Celery("qz")
 app.config_from_object("django.conf:settings", namespace="CELERY")
@@ -13,4 +15,18 @@ app.conf.beat_schedule = {
         "task": "common.tasks.run_scheduled_tasks",
         "schedule": crontab(minute="*"),
     },
+    "prerender-popular-exports": {
+        "task": "modules.tasks.prerender_popular_exports",
+        "schedule": crontab(minute="*/15"),
+    },
+    "refresh-author-leaderboard": {
+        "task": "users.tasks.refresh_author_leaderboard",
+        "schedule": crontab(minute="*/5"),
+    },
+    "flush-write-behind": {
+        "task": "common.tasks.flush_write_behind",
+        "schedule": WRITE_BEHIND_FLUSH_INTERVAL,
+        # A run that waited a whole interval is superseded by the next one
+        "options": {"expires": WRITE_BEHIND_FLUSH_INTERVAL},
+    },
 }
@@ -34,6 +34,7 @@ urlpatterns = [
     path("api/v1/folders/", include("folders.urls")),
     path("api/v1/users/", include("users.urls")),
     path("api/v1/cards/", include("cards.urls")),
+    path("api/v1/io/", include("io_manager.urls")),
     path("api/v1/", include("modules.urls")),
     # docs
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
@@ -0,0 +1,6 @@
+LEADERBOARD_PENDING_KEY = "users:leaderboard:pending"
+LEADERBOARD_AUTHORS_KEY = "users:leaderboard:authors"
+LEADERBOARD_PRIOR_KEY = "users:leaderboard:prior"
+# Rate changes within this many seconds share one refresh
+LEADERBOARD_REFRESH_DELAY = 30
+LEADERBOARD_BATCH_SIZE = 1000
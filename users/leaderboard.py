@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from modules.models import Module
+from users.cache import LEADERBOARD_BATCH_SIZE, LEADERBOARD_PRIOR_KEY
+from users.models import AuthorRating
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+STATS_FIELDS = [
+    "public_modules_count",
+    "rating_sum",
+    "rating_count",
+    "avg_rate",
+    "score",
+    "rank",
+]
+
+
+def leaderboard_prior(sums: np.ndarray, counts: np.ndarray) -> tuple[float, float]:
+    # The site-wide mean, weighted like a typical author's rating count
+    total = counts.sum()
+    mean = float(sums.sum() / total) if total else 0.0
+    rated = counts[counts > 0]
+    weight = max(float(np.median(rated)), 1.0) if rated.size else 1.0
+    return mean, weight
+
+
+def bayesian_scores(
+    sums: np.ndarray, counts: np.ndarray, prior: tuple[float, float]
+) -> np.ndarray:
+    # Averages shrunk towards the prior, so a single 5 doesn't top the list
+    mean, weight = prior
+    return (weight * mean + sums) / (weight + counts)
+
+
+def rank_authors(
+    user_ids: np.ndarray, modules: np.ndarray, counts: np.ndarray, scores: np.ndarray
+) -> np.ndarray:
+    # The last key sorts first: score, then rating and module counts, then id
+    order = np.lexsort((user_ids, -modules, -counts, -scores))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(1, len(order) + 1)
+    return ranks
+
+
+def author_stats(user_ids: Iterable[int] | None = None) -> np.ndarray:
+    modules = Module.objects.filter(visible=Module.Status.PUBLIC)
+    if user_ids is not None:
+        modules = modules.filter(user_id__in=user_ids)
+    rows = list(
+        modules.order_by()
+        .values("user_id")
+        .annotate(
+            modules=Count("pk"),
+            rating_sum=Sum("rating_sum"),
+            rating_count=Sum("rating_count"),
+        )
+        .values_list("user_id", "modules", "rating_sum", "rating_count")
+    )
+    return np.array(rows, dtype=np.int64).reshape(-1, 4).T
+
+
+def author_scores(
+    sums: np.ndarray, counts: np.ndarray, prior: tuple[float, float]
+) -> tuple[np.ndarray, np.ndarray]:
+    averages = np.round(
+        np.divide(sums, counts, out=np.zeros(len(sums)), where=counts > 0), 6
+    )
+    return averages, np.round(bayesian_scores(sums, counts, prior), 6)
+
+
+def compute_leaderboard() -> tuple[dict[int, tuple], tuple[float, float]]:
+    user_ids, modules, sums, counts = author_stats()
+    prior = leaderboard_prior(sums, counts)
+    averages, scores = author_scores(sums, counts, prior)
+    ranks = rank_authors(user_ids, modules, counts, scores)
+    board = {
+        int(user_id): values
+        for user_id, *values in zip(
+            user_ids.tolist(),
+            modules.tolist(),
+            sums.tolist(),
+            counts.tolist(),
+            averages.tolist(),
+            scores.tolist(),
+            ranks.tolist(),
+        )
+    }
+    return board, prior
+
+
+def refresh_leaderboard() -> int:
+    board, prior = compute_leaderboard()
+    current = {
+        user_id: values
+        for user_id, *values in AuthorRating.objects.values_list(
+            "user_id", *STATS_FIELDS
+        )
+    }
+
+    # Only rows whose stats or rank moved are written
+    changed = [
+        AuthorRating(user_id=user_id, **dict(zip(STATS_FIELDS, values)))
+        for user_id, values in board.items()
+        if current.get(user_id) != values
+    ]
+    stale = current.keys() - board.keys()
+    with transaction.atomic():
+        AuthorRating.objects.filter(user_id__in=stale).delete()
+        AuthorRating.objects.bulk_create(
+            changed,
+            batch_size=LEADERBOARD_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=[*STATS_FIELDS, "updated"],
+        )
+    cache.set(LEADERBOARD_PRIOR_KEY, prior, None)
+    return len(changed) + len(stale)
+
+
+def refresh_authors(user_ids: Iterable[int]) -> int:
+    # Scores only compare under the prior of the last full rebuild, which
+    # the periodic refresh keeps moving along with every other author
+    prior = cache.get(LEADERBOARD_PRIOR_KEY)
+    if prior is None:
+        return refresh_leaderboard()
+
+    user_ids = sorted(set(user_ids))
+    ids, modules, sums, counts = author_stats(user_ids)
+    averages, scores = author_scores(sums, counts, prior)
+    stats = {
+        user_id: values
+        for user_id, *values in zip(
+            ids.tolist(),
+            modules.tolist(),
+            sums.tolist(),
+            counts.tolist(),
+            averages.tolist(),
+            scores.tolist(),
+        )
+    }
+    with transaction.atomic():
+        return sum(place_author(user_id, stats.get(user_id)) for user_id in user_ids)
+
+
+def place_author(user_id: int, values: list | None) -> int:
+    row = AuthorRating.objects.select_for_update().filter(user_id=user_id).first()
+    others = AuthorRating.objects.exclude(user_id=user_id)
+    if values is None:
+        if row is None:
+            return 0
+        row.delete()
+        others.filter(rank__gt=row.rank).update(rank=F("rank") - 1)
+        return 1
+
+    modules, rating_sum, rating_count, avg_rate, score = values
+    ahead = others.filter(
+        Q(score__gt=score)
+        | Q(score=score, rating_count__gt=rating_count)
+        | Q(score=score, rating_count=rating_count, public_modules_count__gt=modules)
+        | Q(
+            score=score,
+            rating_count=rating_count,
+            public_modules_count=modules,
+            user_id__lt=user_id,
+        )
+    ).count()
+    rank = ahead + 1
+    stats = dict(zip(STATS_FIELDS, [*values, rank]))
+    if row is not None and all(getattr(row, k) == v for k, v in stats.items()):
+        return 0
+
+    # Only the authors between the old and the new place move by one
+    if row is None:
+        others.filter(rank__gte=rank).update(rank=F("rank") + 1)
+    elif rank < row.rank:
+        others.filter(rank__gte=rank, rank__lt=row.rank).update(rank=F("rank") + 1)
+    elif rank > row.rank:
+        others.filter(rank__gt=row.rank, rank__lte=rank).update(rank=F("rank") - 1)
+    AuthorRating.objects.update_or_create(user_id=user_id, defaults=stats)
+    return 1
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.core.management.base import BaseCommand
+
+from users.leaderboard import refresh_leaderboard
+
+if TYPE_CHECKING:
+    from typing import Any
+
+
+class Command(BaseCommand):
+    help = "Recompute the author leaderboard."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        updated = refresh_leaderboard()
+        self.stdout.write(f"AuthorRating: {updated} rows written")
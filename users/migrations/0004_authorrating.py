@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_alter_user_email"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AuthorRating",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="author_rating",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("public_modules_count", models.PositiveIntegerField(default=0)),
+                ("rating_sum", models.PositiveIntegerField(default=0)),
+                ("rating_count", models.PositiveIntegerField(default=0)),
+                ("avg_rate", models.FloatField(default=0)),
+                ("score", models.FloatField(default=0)),
+                ("rank", models.PositiveIntegerField(db_index=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -11,3 +11,20 @@ class User(AbstractUser):
 
     def __str__(self) -> str:
         return self.username
+
+
+class AuthorRating(models.Model):
+    # Leaderboard row per author of public modules, see users.leaderboard
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="author_rating"
+    )
+    public_modules_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    avg_rate = models.FloatField(default=0)
+    score = models.FloatField(default=0)
+    rank = models.PositiveIntegerField(db_index=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.rank}. {self.user_id}"
@@ -7,9 +7,7 @@ from django.db.models import (
     Q,
     Prefetch,
     Avg,
-    Subquery,
-    OuterRef,
-    IntegerField,
+    F,
     Value,
     DecimalField,
 )
@@ -17,8 +15,10 @@ from django.db.models.functions import Coalesce
 
 from common.permissions import get_accessible_q
 from folders.models import Folder
+from folders.repository import FolderRepository
 from folders.service import FolderService
 from modules.models import Module
+from modules.repository import ModuleRepository
 from modules.service import ModuleService
 from users.models import User
 
@@ -60,7 +60,7 @@ class UserRepository:
 
     @staticmethod
     def with_prefetched_related(
-        qs: QuerySet[User], request: Request | HttpRequest, user: User
+        qs: QuerySet[User], request: Request | HttpRequest
     ) -> QuerySet[User]:
         modules_q = get_accessible_q(request, ModuleService.LIST_ACTION_CHAIN_LINKS)
         folders_q = get_accessible_q(request, FolderService.LIST_ACTION_CHAIN_LINKS)
@@ -68,47 +68,29 @@ class UserRepository:
         return qs.prefetch_related(
             Prefetch(
                 "folders",
-                queryset=Folder.objects.filter(folders_q)
-                .annotate(
-                    modules_count=Count("modules")
-                )
-                .with_ann_saved(user)
-                .with_ann_pinned(user),
+                queryset=FolderRepository.with_modules_count(
+                    Folder.objects.filter(folders_q), modules_q
+                ),
             ),
             Prefetch(
                 "modules",
                 queryset=Module.objects.filter(modules_q)
                 .select_related("lang_from", "lang_to", "topic")
-                .annotate(
-                    avg_rate=Avg("rates__rate"),
-                    cards_count=Count("cards"),
-                )
-                .with_ann_saved(user)
-                .with_ann_pinned(user)
-                .with_ann_perm(user)
-                .prefetch_related("tags", "cards"),
+                .annotate(avg_rate=ModuleRepository.avg_rate())
+                .prefetch_related("tags"),
             ),
         )
 
     @staticmethod
     def with_public_author_stats(qs: QuerySet[User]) -> QuerySet[User]:
-        count_sq = Subquery(
-            Module.objects.filter(user=OuterRef("pk"), visible="public")
-            .values("user")
-            .annotate(cnt=Count("id"))
-            .values("cnt"),
-            output_field=IntegerField(),
-        )
+        # Read from the materialized leaderboard, walked along its rank index
         return (
-            qs.annotate(
-                public_modules_count=Coalesce(count_sq, Value(0)),
-                avg_rate=Coalesce(
-                    Avg("modules__rates__rate", filter=Q(modules__visible="public")),
-                    Value(0.0),
-                    output_field=DecimalField(),
-                ),
+            qs.filter(author_rating__isnull=False)
+            .annotate(
+                public_modules_count=F("author_rating__public_modules_count"),
+                avg_rate=F("author_rating__avg_rate"),
+                rank=F("author_rating__rank"),
             )
-            .filter(public_modules_count__gt=0)
             .only("id", "username", "avatar", "email")
-            .order_by("-avg_rate", "-public_modules_count")
+            .order_by("rank")
         )
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from taggit.serializers import TagListSerializerField
 
+from common.user_state import UserStateBooleanField, UserStateCharField
 from folders.models import Folder
 from languages.serializers import LanguageShortSerializer
 from modules.models import Module
@@ -15,10 +16,12 @@ class UserPublicSerializer(serializers.ModelSerializer):
 
 
 class UserFolderListSerializer(serializers.ModelSerializer):
-    modules_count = serializers.IntegerField(read_only=True)
+    modules_count = serializers.IntegerField(
+        read_only=True, help_text="Modules in the folder that the caller can see."
+    )
 
-    saved = serializers.BooleanField()
-    pinned = serializers.BooleanField()
+    saved = UserStateBooleanField()
+    pinned = UserStateBooleanField()
 
     class Meta:
         model = Folder
@@ -33,10 +36,10 @@ class UserModuleListSerializer(serializers.ModelSerializer):
     cards_count = serializers.IntegerField(read_only=True)
     tags = TagListSerializerField()
 
-    saved = serializers.BooleanField()
-    pinned = serializers.BooleanField()
+    saved = UserStateBooleanField()
+    pinned = UserStateBooleanField()
 
-    user_perm = serializers.CharField()
+    user_perm = UserStateCharField()
     avg_rate = serializers.DecimalField(
         read_only=True,
         max_digits=3,
@@ -106,6 +109,7 @@ class UserRatingListSerializer(serializers.ModelSerializer):
         coerce_to_string=False
     )
     public_modules_count = serializers.IntegerField(read_only=True)
+    rank = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = User
@@ -114,5 +118,6 @@ class UserRatingListSerializer(serializers.ModelSerializer):
             "avatar",
             "username",
             "avg_rate",
-            "public_modules_count"
+            "public_modules_count",
+            "rank",
         ]
@@ -23,8 +23,7 @@ class UserService:
             return qs
 
         if self.action == "retrieve":
-            user = self.request.user
-            qs = UserRepository.with_prefetched_related(qs, self.request, user)
+            qs = UserRepository.with_prefetched_related(qs, self.request)
             qs = UserRepository.with_public_counts(qs)
             return qs
 
@@ -2,17 +2,99 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from django.db.models.signals import post_delete
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
+from django_redis import get_redis_connection
 
+from generic_status.signals import ratings_changed
+from modules.models import Module
+from users.cache import (
+    LEADERBOARD_AUTHORS_KEY,
+    LEADERBOARD_PENDING_KEY,
+    LEADERBOARD_REFRESH_DELAY,
+)
 from .models import User
-from .tasks import delete_avatar_file
+from .tasks import delete_avatar_file, refresh_author_ratings
 
 if TYPE_CHECKING:
-    from typing import Any, Type
+    from typing import Any, Iterable, Type
+
+# Module fields that decide whether and for whom a module counts
+AUTHOR_FIELDS = {"visible", "user", "user_id"}
 
 
 @receiver(post_delete, sender=User)
 def user_post_delete(sender: Type[User], instance: User, **kwargs: Any) -> None:
     if instance.avatar:
         delete_avatar_file.delay(instance.avatar.path)
+
+
+def schedule_author_refresh(user_ids: Iterable[int]) -> None:
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    try:
+        redis = get_redis_connection("default")
+    except NotImplementedError:
+        transaction.on_commit(lambda: refresh_author_ratings.delay(list(user_ids)))
+        return
+
+    # One delayed refresh per burst of changes, for every author they touched
+    def schedule() -> None:
+        redis.sadd(LEADERBOARD_AUTHORS_KEY, *user_ids)
+        if cache.add(LEADERBOARD_PENDING_KEY, True, LEADERBOARD_REFRESH_DELAY * 2):
+            refresh_author_ratings.apply_async(countdown=LEADERBOARD_REFRESH_DELAY)
+
+    transaction.on_commit(schedule)
+
+
+@receiver(ratings_changed, sender=Module)
+def schedule_rated_authors_refresh(
+    sender: Type[Module], object_ids: list[int], **kwargs: Any
+) -> None:
+    schedule_author_refresh(
+        Module.objects.filter(pk__in=object_ids, visible=Module.Status.PUBLIC)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_init, sender=Module)
+def remember_module_author(
+    sender: Type[Module], instance: Module, **kwargs: Any
+) -> None:
+    # Read without loading deferred fields
+    instance._saved_author = (
+        instance.__dict__.get("user_id"),
+        instance.__dict__.get("visible"),
+    )
+
+
+@receiver(post_save, sender=Module)
+def schedule_module_author_refresh(
+    sender: Type[Module],
+    instance: Module,
+    created: bool,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    if update_fields is not None and not AUTHOR_FIELDS & update_fields:
+        return
+    saved = (None, None) if created else instance._saved_author
+    instance._saved_author = (instance.user_id, instance.visible)
+    if saved != instance._saved_author:
+        schedule_author_refresh(
+            user_id
+            for user_id, visible in (saved, instance._saved_author)
+            if user_id is not None and visible == Module.Status.PUBLIC
+        )
+
+
+@receiver(post_delete, sender=Module)
+def schedule_deleted_module_author_refresh(
+    sender: Type[Module], instance: Module, **kwargs: Any
+) -> None:
+    if instance.visible == Module.Status.PUBLIC:
+        schedule_author_refresh([instance.user_id])
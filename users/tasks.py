@@ -1,6 +1,11 @@
 import os
 
 from celery import shared_task
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from users.cache import LEADERBOARD_AUTHORS_KEY, LEADERBOARD_PENDING_KEY
+from users.leaderboard import refresh_authors, refresh_leaderboard
 
 
 @shared_task
@@ -10,3 +15,22 @@ def delete_avatar_file(path: str) -> None:
             os.remove(path)
     except Exception as e:
         pass
+
+
+@shared_task
+def refresh_author_leaderboard() -> int:
+    return refresh_leaderboard()
+
+
+@shared_task
+def refresh_author_ratings(user_ids: list[int] | None = None) -> int:
+    if user_ids is None:
+        # Changes from now on schedule the next refresh
+        cache.delete(LEADERBOARD_PENDING_KEY)
+        redis = get_redis_connection("default")
+        pipe = redis.pipeline()
+        pipe.smembers(LEADERBOARD_AUTHORS_KEY)
+        pipe.delete(LEADERBOARD_AUTHORS_KEY)
+        members, _ = pipe.execute()
+        user_ids = [int(user_id) for user_id in members]
+    return refresh_authors(user_ids)
@@ -13,6 +13,7 @@ from rest_framework import mixins, viewsets, permissions, generics
 
 from common.exeptions import UnRegisteredPolicy
 from common.policy import PolicyRegistry
+from common.views import UserStateMixin
 from users.filters import UserFilter
 from users.models import User
 from users.pagination import UserPagination
@@ -24,7 +25,7 @@ from users.serializers import (
 from users.service import UserService
 
 if TYPE_CHECKING:
-    from django.db.models import QuerySet
+    from django.db.models import Model, QuerySet
     from rest_framework.serializers import Serializer
     from typing import Type
 
@@ -71,6 +72,7 @@ if TYPE_CHECKING:
 )
 @extend_schema(tags=["users"])
 class UserViewSet(
+    UserStateMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     mixins.DestroyModelMixin,
@@ -95,6 +97,11 @@ class UserViewSet(
             pass
         return super().get_permissions()
 
+    def get_user_state_objects(self, objects: list[User]) -> list[Model]:
+        if self.action == "retrieve":
+            return [*objects[0].folders.all(), *objects[0].modules.all()]
+        return objects
+
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action == "retrieve":
             return UserPublicDetailSerializer